@@ -1,111 +1,113 @@
 from tkinter import *
 import calendar
+import re
+from functools import lru_cache
 
-# Function for save year (like button press).
-def save_year_confirm(save_year_inputs):
+# Holiday input like "24, 25,26": the whole string must match, then pull out each number.
+_HOLIDAY_LIST_RE = re.compile(r"\s*-?\d+\s*(?:,\s*-?\d+\s*)*")
+_HOLIDAY_INT_RE = re.compile(r"-?\d+")
+
+# Built once at import. calendar.day_name/month_name re-run strftime on every lookup (and follow the locale).
+# The rest of the app imports these from here instead of keeping its own copies.
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = (None, "January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December")  # None at 0 so MONTH_NAMES[1] = "January"
+
+# Valid numbers for validation, built once. Months have 28-31 days, so one set per month length.
+_VALID_MONTHS = frozenset(range(1, 13))
+_VALID_DAYS_BY_LEN = {n: frozenset(range(1, n + 1)) for n in (28, 29, 30, 31)}
 
-    year_entry = save_year_inputs["give_year_entry"]
-    error_label = save_year_inputs["give_error_label"]
-    current_year_label = save_year_inputs["give_current_year_label"]
-    year = save_year_inputs["give_year"]
+# Only touch the label if the text actually changes - Tk redraws on every .config call.
+def _set_text(label, text):
+    if label.cget("text") != text:
+        label.config(text=text)
+
+# Month and holidays both need monthrange for the same (year, month), so remember the answers.
+@lru_cache(maxsize=256)
+def _monthrange_cached(year, month):
+    return calendar.monthrange(year, month)
+
+# Function for save year (like button press).
+def save_year_confirm(year_entry, error_label, current_year_label, year):
 
     year_input = year_entry.get().strip()  # Get from type box and strip whitespace.
     
-    try:
-        year = int(year_input)   # only this can raise ValueError
-    except ValueError:
-        error_label.config(text="Not a number!")
+    # Check the digits first instead of letting int() raise ValueError on bad input.
+    # Deliberately stricter than int(): only plain digits (with an optional leading "-", so "-5" reaches
+    # the range check) get through - int() would also take things like "+2025" or "2_025".
+    if not year_input.removeprefix("-").isdecimal():
+        _set_text(error_label, "Not a number!")
         return
+    year = int(year_input)
 
-    # Range check outside try — no exception risk here
     if year < 1900 or year > 2100:
-        error_label.config(text="Bad year – 1900-2100.")
+        _set_text(error_label, "Bad year – 1900-2100.")
     else:
-        current_year_label.config(text="Current Year: " + str(year))
-        error_label.config(text="")
+        _set_text(current_year_label, "Current Year: " + str(year))
+        _set_text(error_label, "")
         return year
 
-def save_month_confirm(save_month_inputs):  # Function for the button.
-    
-    month_entry = save_month_inputs["give_month_entry"]
-    error_label = save_month_inputs["give_error_label"]
-    current_month_label = save_month_inputs["give_current_month_label"]
-    month = save_month_inputs["give_month"]
-    year = save_month_inputs["give_year"]
+def save_month_confirm(month_entry, error_label, current_month_label, month, year):  # Function for the button.
 
     if year is None:
-        error_label.config(text="Error: Please select year first!")
+        _set_text(error_label, "Error: Please select year first!")
         return
     
-    month_input = month_entry.get()  # Get from type box.
+    month_input = month_entry.get().strip()  # Read the type box once and strip whitespace.
     
-    try:
-        month = int(month_input)
-    except ValueError:
-        error_label.config(text="That's not a number! Please try again.")  # Error.
+    if not month_input.removeprefix("-").isdecimal():  # Same digit pre-check as the year
+        _set_text(error_label, "That's not a number! Please try again.")  # Error.
         return
+    month = int(month_input)
 
-    if month < 1 or month > 12:
-        error_label.config(text="Please enter a month between 1 and 12.")  # Error.
+    if month not in _VALID_MONTHS:
+        _set_text(error_label, "Please enter a month between 1 and 12.")  # Error.
         return  # Stop early if bad.
     
     # Calculate details.
-    month_details = calendar.monthrange(year, month)
+    month_details = _monthrange_cached(year, month)
     starting_weekday = month_details[0]  # Weekday for Day 1.
     num_days = month_details[1]  # Days in month.
     # Make the days list
-    days_list = []  # Empty list to hold days.
-    for day in range(1, num_days + 1):  # Loop from 1 to num_days +1 (to include last).
-        days_list.append(day)  # Add day to list.
-    # Show the details.
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]  # Group of day names.
+    days_list = list(range(1, num_days + 1))  # 1 to num_days (+1 to include last).
     # Show the month name and days_list in GUI.
-    month_name_list = ["January", "February", "March", "April", "May", "June", "July", "September", "October", "November", "December"]
-    month_name = month_name_list[month-1]
-    current_month_label.config(text="Current Month: " + str(month_name)) # Update month
-    error_label.config(text=f"{month_name} has {len(days_list)} days, start of the weekday: {day_names[starting_weekday]}")  # Update result.
+    month_name = MONTH_NAMES[month]
+    _set_text(current_month_label, "Current Month: " + str(month_name)) # Update month
+    _set_text(error_label, f"{month_name} has {len(days_list)} days, start of the weekday: {DAY_NAMES[starting_weekday]}")  # Update result.
 
     return month, num_days, starting_weekday, days_list
 
-def save_holidays_confirm(save_holidays_inputs):  # Function for the button.
-
-    month = save_holidays_inputs["give_month"]
-    year = save_holidays_inputs["give_year"]
-    holiday_entry = save_holidays_inputs["give_holiday_entry"]
-    holidays_label = save_holidays_inputs["give_holidays_label"]
-    error_label = save_holidays_inputs["give_error_label"]
+def save_holidays_confirm(year, month, holiday_entry, holidays_label, error_label):  # Function for the button.
 
     if year is None or month is None:
-            error_label.config(text="Error: Please select year and month first!")
+            _set_text(error_label, "Error: Please select year and month first!")
             return
 
-    month_details = calendar.monthrange(year, month)
+    month_details = _monthrange_cached(year, month)
     num_days = month_details[1]  # Days in month.
 
-    holiday_input = holiday_entry.get()  # Get from type box.
+    holiday_input = holiday_entry.get().strip()  # Read the type box once and strip whitespace.
     holiday_days = []  # Start empty.
     
-    if holiday_input.strip() == "":  # Check if blank, then save as empty list.
-        holidays_label.config(text="Holiday List: None")
-        error_label.config(text="")  # Clear error.
+    if holiday_input == "":  # Check if blank, then save as empty list.
+        _set_text(holidays_label, "Holiday List: None")
+        _set_text(error_label, "")  # Clear error.
         return holiday_days  # Done. It returns as empty list: holiday_days=[]
     
-    parts = holiday_input.split(",")  # Cut at commas.
-    
-    try:
-        holiday_days = [int(part.strip()) for part in parts]  # Turn to numbers.
-    except ValueError:
-        error_label.config(text="Error: Some entries weren't numbers. Please try again.")  # Error.    
+    # Check the format and read the numbers in one go, instead of split + strip + int per part.
+    if _HOLIDAY_LIST_RE.fullmatch(holiday_input) is None:
+        _set_text(error_label, "Error: Some entries weren't numbers. Please try again.")  # Error.    
         return
+
+    holiday_days = list(map(int, _HOLIDAY_INT_RE.findall(holiday_input)))  # Turn to numbers.
     
     # Check if there are any invalid days, if yes -> return, holiday_days is not changed
-    invalid_days = [d for d in holiday_days if d < 1 or d > num_days]
+    valid_days = _VALID_DAYS_BY_LEN[num_days]
+    invalid_days = [d for d in holiday_days if d not in valid_days]
     if invalid_days:
-        error_label.config(text=f"Error: These days are invalid (must be 1-{num_days}): {invalid_days}")
+        _set_text(error_label, f"Error: These days are invalid (must be 1-{num_days}): {invalid_days}")
         return
 
-    holiday_days = [d for d in holiday_days if 1 <= d <= num_days]
-
-    holidays_label.config(text="Holiday List: " + str(holiday_days))
-    error_label.config(text="")  # Clear if good.
+    _set_text(holidays_label, "Holiday List: " + str(holiday_days))
+    _set_text(error_label, "")  # Clear if good.
     return holiday_days
@@ -1,20 +1,24 @@
 import sys # Easy way for Python to restart
-import pulp  # Bring in the PuLP toolbox.
 import time # Used to show how much time it takes to solve the rota
 import calendar  # Bring in the calendar toolbox for month days.
 import os # Bring in interaction with Windows/Apple/Linux
+import re # Regular expressions, used to check the shift range format
 import json # Bring in functionality of saving/loading javascript object notation - data-interchange format
 from tkinter import *  # Bring in the Tkinter toolbox for the window (GUI). Does not import modules within Tkinter, only functions like Button, Label etc. From ... import syntax brings brings namespace to THIS current namespace
+from tkinter import ttk # Themed widgets - used for the "solving" Progressbar, which classic Tk doesn't have
+from tkinter import font # Named fonts, made once and shared (also a module, so imported separately)
 from tkinter import filedialog # A module (.py file) within tkinter, so it has to be imported separately
 import openpyxl # Allows to use .xlsx files
 from selection_popups import prefer_count, cannot_count, prefer_unit_count, manual_count # bring popup_select_shifts functions from a another file
-from solver import solve_rota # bring PuLP solver from another file
-from date_settings import save_year_confirm, save_month_confirm, save_holidays_confirm
+from date_settings import save_year_confirm, save_month_confirm, save_holidays_confirm, DAY_NAMES
 from pulp_settings import pulp_settings
 from save_load import save_preferences as save_preferences_file, load_preferences as load_preferences_file, load_xlsx_preferences as load_xlsx_preferences_file
+from collections import defaultdict # Dict that creates a default value the first time a key is used
+from types import SimpleNamespace # A simple object to hang named values on: s = SimpleNamespace(x=0); s.x += 1
+from functools import partial # partial(func, row_num) = a ready-made "call func(row_num)" for button commands
+import queue # Thread-safe "to do" list, used to hand solve jobs to the solver thread
 import threading # Allows to run the Tkinter GUI while solving rota (the solving part runs separate)
 import psutil      # Lets us find child processes by parent. Later the subprocesses can be killed, important to shut down cbc.exe midway.
-import subprocess # When closing main app, closes all children windows (like CBC.exe or Windows console)
 
 # --------------------------------------------------------------------
 # App plan:
@@ -32,6 +36,9 @@ month = None
 holiday_days = [] # Empty variable, so "Make shifts" works even if Holidays saved nothing
 shifts_list = []
 workers_list = []
+workers_by_row = {}  # Index into workers_list: {row_num: worker dict}, so finding a worker is one lookup instead of a loop
+shifts_by_name = {}  # Index into shifts_list: {"Day 5 Cardiology": shift dict}, rebuilt whenever shifts_list is
+shifts_by_worker_name = {}  # Assigned shifts per worker: {"Anna": [shift dict, ...]}, kept in step with "assigned_worker"
 units_list = [] # Empty list to store units: "Cardiology", "Internal Medicine - Endocrinology" etc.
 selected_cannot_days = {}  # Changed to dict to store per row_num
 selected_prefer_days = {}  # Dict to store preferred days per row_num
@@ -39,7 +46,17 @@ selected_units = {}        # Dict to store preferred units per row_num
 selected_manual_days = {}  # Dict to store manual days per row_num
 
 # Global variables: constant
-day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]  # Group of day names.
+WEEKEND_WEEKDAYS = frozenset({5, 6})        # Saturday, Sunday (Monday = 0)
+WORKDAY_WEEKDAYS = frozenset({0, 1, 2, 3, 4})  # Monday to Friday
+
+# Pieces of the rota results text, built once instead of for every unit
+RESULTS_THICK_LINE = "=" * 70 + "\n"
+RESULTS_THIN_LINE = "-" * 70 + "\n"
+RESULTS_COLUMN_HEADER = f"{'Day':<7}{'Day Shift':<30}{'Night Shift':<30}\n"
+RESULTS_ROW_FORMAT = "{:<7}{:<30}{:<30}\n".format  # RESULTS_ROW_FORMAT(day, day_worker, night_worker) -> one table line
+# Shift range like "1-4" (spaces around "-" allowed). Each number follows int()'s own rules, as the old
+# split-and-int() parsing did: optional leading "+", "_" between digits, and any Unicode digits (e.g. full-width)
+RANGE_RE = re.compile(r"(\+?\d+(?:_\d+)*)\s*-\s*(\+?\d+(?:_\d+)*)")
 
 # Settings for PuLP: points, hard rules; Other settings: shift making
 points_filled = 100
@@ -52,6 +69,11 @@ enforce_no_adj_nights = True   # Night → Night next day
 enforce_no_adj_days = True   # Day → Day next day hard rule
 include_weekday_days = False   # False = default behaviour (skip Mon-Fri day shifts when making shifts)
 time_limit = 6000
+gap_percent = 1   # Stop once CBC's rota is proven to be within this % of the best possible (0 = prove the very best)
+
+# Debugging: set to True to dump the full shifts/workers lists to the terminal after each change.
+# Off by default - printing hundreds of lines on every click stalls the GUI.
+DEBUG_PRINTS = False
 # -------------------------------------------------------
 # The main window (like the car's dashboard).
 # -------------------------------------------------------
@@ -60,6 +82,12 @@ root = Tk()  # Make the window box.
 #root.geometry("975x450")  # Set predetermined window size (width x height)
 root.title("Hospital Shift Manager 'Riaukapp'")  # Name on top.
 
+# Fonts for the rota results popup. Made once here (they need root to exist) and reused by every popup,
+# instead of Tk building new font objects each time a rota is shown.
+RESULTS_TITLE_FONT = font.Font(root, family="Courier", size=12, weight="bold")
+RESULTS_UNIT_FONT = font.Font(root, family="Courier", size=11, weight="bold")
+RESULTS_HEADER_FONT = font.Font(root, family="Courier", size=10, weight="bold")
+
 # Top frame designed for LabelFrame and Utilities frame
 top_frame = Frame(root)
 top_frame.pack(padx=8, pady=(8, 2), fill="x", anchor="w")
@@ -87,14 +115,7 @@ year_entry.pack(side=LEFT)  # Next to label.
 def save_year():
     global year, month, num_days, starting_weekday, days_list
 
-    save_year_inputs = {
-        "give_year_entry": year_entry,
-        "give_error_label": error_label,
-        "give_current_year_label": current_year_label,
-        "give_year": year,
-    }
-    
-    result = save_year_confirm(save_year_inputs)
+    result = save_year_confirm(year_entry, error_label, current_year_label, year)
     if result is not None:
         year = result
         # Reset month data — it was calculated for the old year
@@ -129,16 +150,8 @@ def save_month():
         error_label.config(text="Error: Cannot change months after workers have been added. Remove all workers first.")
         return  
 
-    save_month_inputs = {
-        "give_month_entry": month_entry,
-        "give_error_label": error_label,
-        "give_current_month_label": current_month_label,
-        "give_month": month,
-        "give_year": year,
-    }
-
     # Handles None safely, for example if year was not set, the function would return None, but this code would try to unpack the tuple (month, num_days etc.), but it can't because it's None!
-    result = save_month_confirm(save_month_inputs)
+    result = save_month_confirm(month_entry, error_label, current_month_label, month, year)
     if result is not None:
         month, num_days, starting_weekday, days_list = result
         if holiday_days:
@@ -163,15 +176,7 @@ holiday_entry.pack(side=LEFT)
 def save_holidays():  # Function for the button.
     global holiday_days  # Use the holiday_days box outside.
 
-    save_holidays_inputs = {
-        "give_year": year,
-        "give_month": month,
-        "give_holiday_entry": holiday_entry,
-        "give_holidays_label": holidays_label,
-        "give_error_label": error_label,
-    }
-
-    result = save_holidays_confirm(save_holidays_inputs)
+    result = save_holidays_confirm(year, month, holiday_entry, holidays_label, error_label)
     if result is not None:
         holiday_days = result
     
@@ -192,8 +197,12 @@ units_frame.pack(anchor="w")
 units_entry = Entry(units_frame, width=40)
 units_entry.pack(side=LEFT)
 
+# Remember the last text that was saved and the units it produced, so pressing Save again does no re-parsing
+last_units_input = None
+last_units_saved = None
+
 def save_units():
-    global units_list
+    global units_list, last_units_input, last_units_saved
 
     if workers_list:
         error_label.config(text="Error: Cannot change units after workers have been added. Remove all workers first.")
@@ -201,6 +210,11 @@ def save_units():
 
     units_input = units_entry.get().strip()
 
+    # Same text as last time AND units_list not changed since (Load replaces it in-place) → already saved
+    if units_input == last_units_input and units_list == last_units_saved:
+        error_label.config(text=f"{len(units_list)} unit(s) saved.")
+        return
+
     # Split by comma and clean up whitespace
     units_list = [u.strip() for u in units_input.split(",") if u.strip()] # give me u.strip(), for each u in the split list, but only if u.strip() is not empty".
     
@@ -211,6 +225,8 @@ def save_units():
     
     current_units_label.config(text=f"Current Units: {', '.join(units_list)}")
     error_label.config(text=f"{len(units_list)} unit(s) saved.")
+    last_units_input = units_input
+    last_units_saved = list(units_list)  # A copy, so later in-place changes to units_list don't change it too
 
 Button(units_frame, text="Save", command=save_units).pack(side=LEFT)
 
@@ -308,11 +324,13 @@ worker_container.pack()
 # Create the canvas (drawing board)
 global worker_canvas, worker_scrollbar, worker_inner_frame
 worker_canvas = Canvas(worker_container, width=833, borderwidth=2, relief="groove")  # Height=200 pixels – change if you want taller/shorter
-worker_canvas.pack(side=LEFT, fill="both")  # Put on left, fill space
 
 # Create the scrollbar and link it to the canvas
 worker_scrollbar = Scrollbar(worker_container, orient="vertical", command=worker_canvas.yview)
-worker_scrollbar.pack(side=RIGHT, fill="y")  # Put on right, vertical
+# The canvas keeps an empty strip on its right as wide as the scrollbar. The scrollbar is placed into that
+# strip only when the rows don't fit (see do_update_scroll_region), so showing/hiding it never moves the table.
+worker_canvas.pack(side=LEFT, fill="both", padx=(0, worker_scrollbar.winfo_reqwidth()))  # Put on left, fill space
+scrollbar_shown = False  # Is the scrollbar placed right now?
 
 # Link canvas back to scrollbar (so it knows when to show the slider)
 worker_canvas.configure(yscrollcommand=worker_scrollbar.set)
@@ -322,29 +340,92 @@ worker_inner_frame = Frame(worker_canvas)
 worker_canvas.create_window((0, 0), window=worker_inner_frame, anchor="nw")  # Put the frame at top-left of canvas
 
 # Mouse wheel
-def on_mouse_wheel(event):
-    worker_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")  # Scroll up/down with wheel
+# Touchpads send many tiny wheel events. Add them up and scroll once every 16 ms (about 60 times a second).
+wheel_delta = 0        # Wheel movement not scrolled yet
+wheel_flush_job = None  # root.after job ID while a scroll is waiting
 
-root.bind("<MouseWheel>", on_mouse_wheel)  # Link wheel to function
+def on_mouse_wheel(event):
+    global wheel_delta, wheel_flush_job
+    wheel_delta += event.delta
+    if wheel_flush_job is None:
+        wheel_flush_job = root.after(16, flush_mouse_wheel)
+
+def flush_mouse_wheel():
+    global wheel_delta, wheel_flush_job
+    wheel_flush_job = None
+    units = int(-1 * (wheel_delta / 120))  # 120 = one wheel notch
+    if units:
+        worker_canvas.yview_scroll(units, "units")  # Scroll up/down with wheel
+        # Take off only the whole notches just scrolled (units has the opposite sign to the delta),
+        # so the leftover part of a notch from a touchpad or fine-grained wheel isn't lost
+        wheel_delta += units * 120
+    # Less than a notch: keep it in wheel_delta until more movement adds up
+
+# Only listen to the wheel while the mouse is over the worker table, not anywhere in the app
+def on_canvas_leave(event):
+    # Moving onto a row's Entry/Button also counts as "leaving" the canvas - only unbind
+    # if the mouse is really outside (the widget under it isn't the canvas or inside it)
+    # Compare whole path parts: a plain startswith would also match a sibling like ".!canvas2" for ".!canvas"
+    widget_under_mouse = worker_canvas.winfo_containing(event.x_root, event.y_root)
+    canvas_path = str(worker_canvas)
+    widget_path = str(widget_under_mouse) if widget_under_mouse is not None else ""
+    if not (widget_path == canvas_path or widget_path.startswith(canvas_path + ".")):
+        worker_canvas.unbind_all("<MouseWheel>")
+
+worker_canvas.bind("<Enter>", lambda event: worker_canvas.bind_all("<MouseWheel>", on_mouse_wheel))
+worker_canvas.bind("<Leave>", on_canvas_leave)
+
+scroll_update_pending = False  # True while an update is already queued for the next idle moment
+worker_canvas_height = None     # Last height given to worker_canvas, so we only resize when it changes
+measured_layout = None          # Inner frame (width, height, reqheight) the scroll area was last set up for
 
 # Make the canvas scroll when the inner frame grows
 def update_scroll_region(event):
-    worker_canvas.configure(scrollregion=worker_canvas.bbox("all"))  # Keep this – updates scroll area
+    # Adding one row fires several <Configure> events in a burst. Queue ONE update for when
+    # Tk is idle instead of measuring every child widget again for each event.
+    global scroll_update_pending
+    if scroll_update_pending:
+        return
+    scroll_update_pending = True
+    root.after_idle(do_update_scroll_region)
+
+def do_update_scroll_region():
+    global scroll_update_pending, worker_canvas_height, measured_layout, scrollbar_shown
+    scroll_update_pending = False
 
     # Ask inner_frame how tall it needs to be (reqheight = "required height")
     required_height = worker_inner_frame.winfo_reqheight()  # This is like measuring the stack of rows
 
+    # Same size as last time (e.g. a row changed but the table didn't grow) → scroll area is still right
+    layout = (worker_inner_frame.winfo_width(), worker_inner_frame.winfo_height(), required_height)
+    if layout == measured_layout:
+        return
+    measured_layout = layout
+
+    worker_canvas.configure(scrollregion=worker_canvas.bbox("all"))  # Keep this – updates scroll area
+
     # Decide the height: Min of required or 200 (the max)
     max_height = 300  # Your max – change if you want
     new_height = min(required_height, max_height)  # min() picks the smaller one
 
-    # Set the canvas height to that
-    worker_canvas.config(height=new_height)  # Update it!
-
-    # If required > max, scrollbar will show automatically – no extra code needed
+    # Set the canvas height to that - but only if it changed, because resizing fires <Configure> again
+    if new_height != worker_canvas_height:
+        worker_canvas.config(height=new_height)  # Update it!
+        worker_canvas_height = new_height
+
+    # Show the scrollbar only when the rows are taller than the max. place() puts it in the reserved strip
+    # without touching the canvas, so nothing else has to be laid out again.
+    needs_scrollbar = required_height > max_height
+    if needs_scrollbar != scrollbar_shown:
+        if needs_scrollbar:
+            worker_scrollbar.place(relx=1.0, rely=0, relheight=1.0, anchor="ne")  # Right edge, full height
+        else:
+            worker_scrollbar.place_forget()
+        scrollbar_shown = needs_scrollbar
 
 def update_inner_width(event):
-    worker_inner_frame.config(width=event.width)  # Set width to match canvas
+    if event.width != worker_inner_frame.winfo_width():  # Skip if it already matches
+        worker_inner_frame.config(width=event.width)  # Set width to match canvas
 
 worker_canvas.bind("<Configure>", update_inner_width)  # Run this when canvas size changes
 
@@ -363,37 +444,54 @@ def make_shifts():  # Function for making shifts list.
         return
 
     shifts_list.clear()  # Empty list for shifts.
-    shift_types = ["Day", "Night"]  # Group of types.
-    
-    # Loop through each unit
-    for unit in units_list:
-        for day in days_list:  # Loop each day.
-            weekday = (starting_weekday + (day - 1)) % 7  # Calculate day name ( %7 like clock wrap).
-            tags = [day_names[weekday]]  # Add day name tag.
-            if weekday in [5, 6]:  # Sat/Sun – weekend.
+    shifts_by_name.clear()
+    shifts_by_worker_name.clear()  # New shifts start unassigned
+    holiday_set = set(holiday_days)  # Set, so "is this day a holiday?" is one lookup
+
+    # Work out each day's tags and shift types ONCE - they are the same for every unit
+    day_plan = []  # [(day, tags, shift types on that day), ...]
+    tags_cache = {}  # (weekday, is_holiday) -> tags tuple. Only 14 combinations, so days share them
+    for day in days_list:  # Loop each day.
+        weekday = (starting_weekday + (day - 1)) % 7  # Calculate day name ( %7 like clock wrap).
+        is_holiday = day in holiday_set
+        tags = tags_cache.get((weekday, is_holiday))
+        if tags is None:
+            tags = [DAY_NAMES[weekday]]  # Add day name tag.
+            if weekday in WEEKEND_WEEKDAYS:  # Sat/Sun – weekend.
                 tags.append("Weekend")  # Add tag.
-            if day in holiday_days:  # If holiday.
+            if is_holiday:  # If holiday.
                 tags.append("Public holiday")  # Add tag.
-            for shift_type in shift_types:  # Loop Day then Night.
-                # Check if this is a Monday-Friday Day shift (and not a holiday) – if both true, exclude (skip)
-                if (not include_weekday_days) and weekday in [0, 1, 2, 3, 4] and shift_type == "Day" and day not in holiday_days:
-                    continue  # Skip Mon-Fri day shifts only when the checkbox is OFF
+            tags = tags_cache[(weekday, is_holiday)] = tuple(tags)  # Tuple, so no shift can change the shared tags
+        # Check if this is a Monday-Friday (and not a holiday) – if so, skip its Day shift
+        if (not include_weekday_days) and weekday in WORKDAY_WEEKDAYS and not is_holiday:
+            shift_types = ("Night",)  # Skip Mon-Fri day shifts only when the checkbox is OFF
+        else:
+            shift_types = ("Day", "Night")  # Day then Night.
+        day_plan.append((day, tags, shift_types))
+
+    # Loop through each unit
+    for unit in units_list:
+        for day, tags, shift_types in day_plan:
+            for shift_type in shift_types:
                 shift_name = f"{shift_type} {day} {unit}"  # Make name: ex. Cardiology Day 1, Internal Medicine Night 2...
                 shift_dict = {  # Make the shift box.
                     "name": shift_name,
                     "type": shift_type,
+                    "day": day,  # Day number as int, so the solver doesn't have to parse it back out of the name
                     "tags": tags,
                     "unit": unit,
                     "assigned_worker": None
                 }
                 shifts_list.append(shift_dict)  # Add to list.
-        
-        error_label.config(text=f"Shifts made: {len(shifts_list)} across {len(units_list)} unit(s)") # Update the label with count.
-        
-        # Show the shifts list nicely in terminal, for debugging
-        print("Your shifts list (with tags, types):")
-        for shift in shifts_list:  # Loop to print each one.
-            print(f"Shift: {shift['name']}, Tags: {shift['tags']}, Type: {shift['type']}, Assigned: {shift['assigned_worker']}")
+                shifts_by_name[shift_name] = shift_dict
+
+    error_label.config(text=f"Shifts made: {len(shifts_list)} across {len(units_list)} unit(s)") # Update the label with count.
+
+    # Show the shifts list nicely in terminal, for debugging (one print call for the whole list)
+    if DEBUG_PRINTS:
+        print("Your shifts list (with tags, types):\n" + "\n".join(
+            f"Shift: {shift['name']}, Tags: {shift['tags']}, Type: {shift['type']}, Assigned: {shift['assigned_worker']}"
+            for shift in shifts_list))
 
 # Box to show the shifts list.
 #shifts_label = Label(root, text="Shifts made: None")  # Start None.
@@ -406,7 +504,7 @@ workers_frame.pack(fill="x")  # Fill horizontal, stack vertical
 '''
 The layout of all worker containers:
 
-worker_container        → positions canvas + scrollbar side by side (pack LEFT / RIGHT)
+worker_container        → holds the canvas (pack LEFT) and the scrollbar (place, right edge, only when needed)
   └── worker_canvas     → provides the scrollable viewport
         └── worker_inner_frame  → the actual scrollable surface (grows as rows are added)
               └── workers_frame → owns the grid layout (headers + data rows)
@@ -428,31 +526,25 @@ So workers_frame exists purely to isolate the grid layout in its own container,
 keeping pack and grid separated into different parent widgets              
 '''
               
-# Configure columns to have fixed width of 50
-for col in range(10):
-    workers_frame.columnconfigure(col, minsize=10, weight=0)
-
-# Global headers for columns.
-Label(workers_frame, text="Name", width=10, padx=2, pady=2).grid(row=0, column=0, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Shift Range", width=10, padx=2, pady=2).grid(row=0, column=1, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Cannot Days", width=10, padx=2, pady=2).grid(row=0, column=2, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Prefer Days", width=10, padx=2, pady=2).grid(row=0, column=3, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Max Wknds", width=10, padx=2, pady=2).grid(row=0, column=4, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Max 24hr", width=10, padx=2, pady=2).grid(row=0, column=5, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Prefer Unit", width=10, padx=2, pady=2).grid(row=0, column=6, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Manual Shifts", width=10, padx=2, pady=2).grid(row=0, column=7, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Save", width=10, padx=2, pady=2).grid(row=0, column=8, sticky="ew", padx=2, pady=2)
-Label(workers_frame, text="Delete", width=10, padx=2, pady=2).grid(row=0, column=9, sticky="ew", padx=2, pady=2)
-
-# List to hold worker rows (for delete).
-worker_rows = []  # Empty list to store widget references for each row.
+# Global headers for columns, left to right.
+WORKER_HEADERS = ("Name", "Shift Range", "Cannot Days", "Prefer Days", "Max Wknds",
+                  "Max 24hr", "Prefer Unit", "Manual Shifts", "Save", "Delete")
+
+# Configure all columns in one call (Tk accepts a list of column numbers)
+workers_frame.columnconfigure(tuple(range(len(WORKER_HEADERS))), minsize=10, weight=0)
+
+for col, header in enumerate(WORKER_HEADERS):
+    Label(workers_frame, text=header, width=10, padx=2, pady=2).grid(row=0, column=col, sticky="ew", padx=2, pady=2)
+
+# Dict to hold worker rows (for delete): {row_num: widget references for that row}
+worker_rows = {}  # Keyed by row_num, so any row's widgets can be found without looping.
 worker_row_number = 1  # Start row 1 (after 0 headers)
 
 # The worker_row_number is never reset to 1 when deleting worker rows
 # because it serves as a unique ID and a key in dictionaries like selected_cannot_days etc.
 
 def add_worker_row():  # Function for "Add Worker" button.
-    global worker_row_number, workers_list
+    global worker_row_number
     
     if year is None or month is None:
         error_label.config(text="Error: Please set year and month before adding workers.")
@@ -469,15 +561,16 @@ def add_worker_row():  # Function for "Add Worker" button.
     name_entry.grid(row=row_num, column=0, sticky="ew", padx=2, pady=2)
 
     # Column 1: Shift range box.
-    range_entry = Entry(workers_frame, width=10)
+    range_var = StringVar()  # Holds the range text, so it can be replaced with one .set() call
+    range_entry = Entry(workers_frame, width=10, textvariable=range_var)
     range_entry.grid(row=row_num, column=1, sticky="ew", padx=2, pady=2)
 
     # Column 2: Cannot work button.
-    cannot_button = Button(workers_frame, text="Select", width=10, command=lambda: show_cannot_popup(row_num))
+    cannot_button = Button(workers_frame, text="Select", width=10, command=partial(show_cannot_popup, row_num))
     cannot_button.grid(row=row_num, column=2, sticky="ew", padx=2, pady=2)
 
     # Column 3: Prefer button.
-    prefer_button = Button(workers_frame, text="Select", width=10, command=lambda: show_prefer_popup(row_num))
+    prefer_button = Button(workers_frame, text="Select", width=10, command=partial(show_prefer_popup, row_num))
     prefer_button.grid(row=row_num, column=3, sticky="ew", padx=2, pady=2)
 
     # Column 4: Max weekends box.
@@ -489,25 +582,26 @@ def add_worker_row():  # Function for "Add Worker" button.
     max_24hr_entry.grid(row=row_num, column=5, sticky="ew", padx=2, pady=2)
 
     # Column 6: Prefer_unit_button.
-    prefer_unit_button = Button(workers_frame, text="Select", width=10, command=lambda: show_prefer_unit_popup(row_num))
+    prefer_unit_button = Button(workers_frame, text="Select", width=10, command=partial(show_prefer_unit_popup, row_num))
     prefer_unit_button.grid(row=row_num, column=6, sticky="ew", padx=2, pady=2)
 
     # Column 7: Manual shifts button.
-    manual_button = Button(workers_frame, text="Select", width=10, command=lambda: show_manual_popup(row_num))
+    manual_button = Button(workers_frame, text="Select", width=10, command=partial(show_manual_popup, row_num))
     manual_button.grid(row=row_num, column=7, sticky="ew", padx=2, pady=2)
 
     # Column 8: Save Worker button.
-    save_button = Button(workers_frame, text="Save", width=10, command=lambda: save_worker(row_num))
+    save_button = Button(workers_frame, text="Save", width=10, command=partial(save_worker, row_num))
     save_button.grid(row=row_num, column=8, sticky="ew", padx=2, pady=2)
 
     # Column 9: Delete button.
-    delete_button = Button(workers_frame, text="Delete", width=10, command=lambda: delete_row(row_num))
+    delete_button = Button(workers_frame, text="Delete", width=10, command=partial(delete_row, row_num))
     delete_button.grid(row=row_num, column=9, sticky="ew", padx=2, pady=2)
 
     # Store all widgets for this row for deletion purposes
     row_widgets = {
         'name_entry': name_entry,
         'range_entry': range_entry,
+        'range_var': range_var,
         'cannot_button': cannot_button,
         'prefer_button': prefer_button,
         'max_weekends_entry': max_weekends_entry,
@@ -518,193 +612,186 @@ def add_worker_row():  # Function for "Add Worker" button.
         'delete_button': delete_button,
         'row_num': row_num
     }
-    worker_rows.append(row_widgets)
-    print(f"Current row: {worker_row_number}") #Debugging
+    worker_rows[row_num] = row_widgets
+    if DEBUG_PRINTS:
+        print(f"Current row: {worker_row_number}") #Debugging
     worker_row_number += 1  # Add 1. 
+
+# Save / manual buttons live at module level (not inside add_worker_row), so every row shares the same
+# two functions and finds its own Entry widgets through worker_rows[row_num].
+def save_worker(row_num):
+    """
+    Validates and saves (or updates) a worker from the GUI row identified by row_num.
+
+    Reads input from the Entry widgets of that row, found through worker_rows[row_num].
+    Validates that name is not blank, shift range is in "min-max" format with valid numbers,
+    and that max_weekends / max_24hr are non-negative integers (default 100 if left blank).
+    Also reads cannot_work days, preferred days, and preferred units from their global dicts.
+
+    If validation passes:
+    - If a worker with this row_num already exists in workers_list, updates their data.
+    - Otherwise, creates a new worker dict and appends it to workers_list.
+
+    Args:
+        row_num (int): The unique ID of this worker row, used as a key in all
+                    per-row dictionaries (selected_cannot_days, etc.).
+    """
+
+    row_widgets = worker_rows[row_num]  # This row's widgets
+    name = row_widgets['name_entry'].get().strip() # Get the name
+    range_input = row_widgets['range_entry'].get().strip()  # Get shift range.
+    max_weekends_input = row_widgets['max_weekends_entry'].get().strip()  # Get max weekends.
+    max_24hr_input = row_widgets['max_24hr_entry'].get().strip()  # Get max 24-hour.
     
-    def save_worker(row_num):
-        """
-        Validates and saves (or updates) a worker from the GUI row identified by row_num.
-
-        Reads input from the Entry widgets captured in the enclosing add_worker_row() scope.
-        Validates that name is not blank, shift range is in "min-max" format with valid numbers,
-        and that max_weekends / max_24hr are non-negative integers (default 100 if left blank).
-        Also reads cannot_work days, preferred days, and preferred units from their global dicts.
-
-        If validation passes:
-        - If a worker with this row_num already exists in workers_list, updates their data.
-        - Otherwise, creates a new worker dict and appends it to workers_list.
-
-        Args:
-            row_num (int): The unique ID of this worker row, used as a key in all
-                        per-row dictionaries (selected_cannot_days, etc.).
-        """
-
-        name = name_entry.get().strip() # Get the name
-        range_input = range_entry.get().strip()  # Get shift range.
-        max_weekends_input = max_weekends_entry.get().strip()  # Get max weekends.
-        max_24hr_input = max_24hr_entry.get().strip()  # Get max 24-hour.
-        
-        # Cannot work and other from selected days.
-        cannot_work = selected_cannot_days.get(row_num, [])  # Get the list for this row_num.
-        prefer = selected_prefer_days.get(row_num, [])  # Get the list for this row_num.
-        prefer_units = selected_units.get(row_num, []) # Get the list for this row_num for prefer_units
-
-        # Check if name is not blank.
-        if name == "":  # If empty.
-            error_label.config(text="Error: Name can't be blank.")  # Show error.
-            return  # Stop early.
-
-        # Check shift range (like "1-4").
-        if range_input == "":  # If blank.
-            error_label.config(text="Error: Shift range can't be blank.")  # Error.
-            return
-        range_parts = range_input.split("-")  # Cut at "-".
-        if len(range_parts) != 2:  # Must be 2.
+    # Cannot work and other from selected days.
+    cannot_work = selected_cannot_days.get(row_num, [])  # Get the list for this row_num.
+    prefer = selected_prefer_days.get(row_num, [])  # Get the list for this row_num.
+    prefer_units = selected_units.get(row_num, []) # Get the list for this row_num for prefer_units
+
+    # Check if name is not blank.
+    if name == "":  # If empty.
+        error_label.config(text="Error: Name can't be blank.")  # Show error.
+        return  # Stop early.
+
+    # Check shift range (like "1-4").
+    if range_input == "":  # If blank.
+        error_label.config(text="Error: Shift range can't be blank.")  # Error.
+        return
+    range_match = RANGE_RE.fullmatch(range_input)  # Checks the format and picks out both numbers, no try/except
+    if range_match is None:
+        if range_input.count("-") != 1:  # Must be 2 parts.
             error_label.config(text="Error: Range like 1-4.")  # Error.
-            return
+        else:
+            error_label.config(text="Error: Range not numbers.")  # Error.
+        return
+    min_shifts = int(range_match.group(1))
+    max_shifts = int(range_match.group(2))
+    if min_shifts > max_shifts:  # No "-" sign can get through, so never negative
+        error_label.config(text="Error: Min <= Max, positive.")  # Error.
+        return
+
+    # Max weekends and 24hr – numbers.
+    max_weekends = 100  # Default 100.
+    if max_weekends_input != "":
         try:
-            min_shifts = int(range_parts[0])
-            max_shifts = int(range_parts[1])
-            if min_shifts > max_shifts or min_shifts < 0:
-                error_label.config(text="Error: Min <= Max, positive.")  # Error.
+            max_weekends = int(max_weekends_input)
+            if max_weekends < 0:
+                error_label.config(text="Error: Max weekends positive or 0.")
                 return
         except ValueError:
-            error_label.config(text="Error: Range not numbers.")  # Error.
+            error_label.config(text="Error: Max weekends not number.")
             return
 
-        # Max weekends and 24hr – numbers.
-        max_weekends = 100  # Default 100.
-        if max_weekends_input != "":
-            try:
-                max_weekends = int(max_weekends_input)
-                if max_weekends < 0:
-                    error_label.config(text="Error: Max weekends positive or 0.")
-                    return
-            except ValueError:
-                error_label.config(text="Error: Max weekends not number.")
-                return
-
-        max_24hr = 100  # Default 100.
-        if max_24hr_input != "":
-            try:
-                max_24hr = int(max_24hr_input)
-                if max_24hr < 0:
-                    error_label.config(text="Error: Max 24hr positive or 0.")
-                    return
-            except ValueError:
-                error_label.config(text="Error: Max 24hr not number.")
+    max_24hr = 100  # Default 100.
+    if max_24hr_input != "":
+        try:
+            max_24hr = int(max_24hr_input)
+            if max_24hr < 0:
+                error_label.config(text="Error: Max 24hr positive or 0.")
                 return
-
-        # ===== Check if worker already exists =====
-        # Look through workers_list to find this worker by row number
-        existing_worker = None  # Start with None (not found).
-        for worker in workers_list:
-            if worker["worker_row_number"] == row_num:
-                existing_worker = worker  # Found them!
-                break  # Stop looking.
-
-        if existing_worker:  # If we found them (updating)
-            # Update the existing worker's data
-            existing_worker["name"] = name
-            existing_worker["shifts_to_fill"] = [min_shifts, max_shifts]
-            existing_worker["cannot_work"] = cannot_work
-            existing_worker["prefers"] = prefer
-            existing_worker["prefer_units"] = prefer_units
-            existing_worker["max_weekends"] = max_weekends
-            existing_worker["max_24hr"] = max_24hr
-            # Show message if succesful
-            message = f"Worker '{name}' updated!"
-            error_label.config(text=message)  # Show success.
-        else:  # If not found (new worker)
-            # Create new worker dictionary
-            worker_dict = {
-                "name": name,
-                "shifts_to_fill": [min_shifts, max_shifts],
-                "cannot_work": cannot_work,
-                "prefers": prefer,
-                "prefer_units": prefer_units,
-                "max_weekends": max_weekends,
-                "max_24hr": max_24hr,
-                "worker_row_number": row_num
-            }
-            workers_list.append(worker_dict)  # Add new worker.
-            error_label.config(text=f"Worker '{name}' saved!")  # Show success.
-
-        # Print for debugging
-        print("Your full worker list:")
-        for worker in workers_list:
-            print(f"Name: {worker['name']}, shifts: {worker['shifts_to_fill']}, Cannot: {worker['cannot_work']}, Prefers: {worker['prefers']}, Max weekends: {worker['max_weekends']}, Max 24hr: {worker['max_24hr']}, Prefers units: {worker['prefer_units']} Row number: {worker['worker_row_number']}")
-
-        '''
-        Note on dictionaries: both worker_dict and separate selected_cannot_days + other dictionaries store similar data.
-        The solver (solver.py) reads cannot_work, prefers, and prefer_units directly from the worker dict in workers_list. It never touches selected_cannot_days, selected_prefer_days, or selected_units at all.
-        So these three fields must be stored in the worker dict — the solver depends on them being there. Without them, the solver would have no cannot/prefer information and the rota would be generated ignoring all those preferences.
-        selected_manual_days works differently because manual shifts are pre-assigned to shifts_list before the solver even runs (via assign_all_manual_shifts() on line 1442), so the solver never needs to look them up from the worker dict.
-        In summary:
-        cannot_work, prefers, prefer_units → must be in the worker dict (solver reads them)
-        manual days → don't need to be in the worker dict (handled before the solver runs)
-        '''
-
-    def save_manual(row_num):
-        # Get worker name
-        name = name_entry.get().strip()
-        if not name:
-            error_label.config(text="Error: Worker name required for manual save.")
+        except ValueError:
+            error_label.config(text="Error: Max 24hr not number.")
             return
 
-        # Find worker
-        worker = None
-        for w in workers_list:
-            if w.get("worker_row_number") == row_num:
-                worker = w
-                break
-        if not worker:
-            error_label.config(text="Error: Save worker first before manual assignment.")
-            return
+    # ===== Check if worker already exists =====
+    # Look up this worker by row number (None if not saved yet)
+    existing_worker = workers_by_row.get(row_num)
+
+    if existing_worker:  # If we found them (updating)
+        # Update the existing worker's data
+        existing_worker["name"] = name
+        existing_worker["shifts_to_fill"] = [min_shifts, max_shifts]
+        existing_worker["cannot_work"] = cannot_work
+        existing_worker["prefers"] = prefer
+        existing_worker["prefer_units"] = prefer_units
+        existing_worker["max_weekends"] = max_weekends
+        existing_worker["max_24hr"] = max_24hr
+        # Show message if succesful
+        message = f"Worker '{name}' updated!"
+        error_label.config(text=message)  # Show success.
+    else:  # If not found (new worker)
+        # Create new worker dictionary
+        worker_dict = {
+            "name": name,
+            "shifts_to_fill": [min_shifts, max_shifts],
+            "cannot_work": cannot_work,
+            "prefers": prefer,
+            "prefer_units": prefer_units,
+            "max_weekends": max_weekends,
+            "max_24hr": max_24hr,
+            "worker_row_number": row_num
+        }
+        workers_list.append(worker_dict)  # Add new worker.
+        workers_by_row[row_num] = worker_dict
+        error_label.config(text=f"Worker '{name}' saved!")  # Show success.
+
+    # Print for debugging
+    if DEBUG_PRINTS:
+        print("Your full worker list:\n" + "\n".join(
+            f"Name: {worker['name']}, shifts: {worker['shifts_to_fill']}, Cannot: {worker['cannot_work']}, Prefers: {worker['prefers']}, Max weekends: {worker['max_weekends']}, Max 24hr: {worker['max_24hr']}, Prefers units: {worker['prefer_units']} Row number: {worker['worker_row_number']}"
+            for worker in workers_list))
+
+    '''
+    Note on dictionaries: both worker_dict and separate selected_cannot_days + other dictionaries store similar data.
+    The solver (solver.py) reads cannot_work, prefers, and prefer_units directly from the worker dict in workers_list. It never touches selected_cannot_days, selected_prefer_days, or selected_units at all.
+    So these three fields must be stored in the worker dict — the solver depends on them being there. Without them, the solver would have no cannot/prefer information and the rota would be generated ignoring all those preferences.
+    selected_manual_days works differently because manual shifts are pre-assigned to shifts_list before the solver even runs (via assign_all_manual_shifts() on line 1442), so the solver never needs to look them up from the worker dict.
+    In summary:
+    cannot_work, prefers, prefer_units → must be in the worker dict (solver reads them)
+    manual days → don't need to be in the worker dict (handled before the solver runs)
+    '''
+
+def save_manual(row_num):
+    row_widgets = worker_rows[row_num]  # This row's widgets
+    # Get worker name
+    name = row_widgets['name_entry'].get().strip()
+    if not name:
+        error_label.config(text="Error: Worker name required for manual save.")
+        return
 
-        # Get selected shifts
-        manual_shifts = selected_manual_days.get(row_num, [])
-        if not manual_shifts:
-            error_label.config(text="No manual shifts selected.")
-            return
+    # Find worker
+    worker = workers_by_row.get(row_num)
+    if not worker:
+        error_label.config(text="Error: Save worker first before manual assignment.")
+        return
 
-        successful_assigns = 0
-        for shift_name in manual_shifts:
-            # Find shift in shifts_list
-            shift = None
-            for s in shifts_list:
-                if s["name"] == shift_name:
-                    shift = s
-                    break
-            if not shift:
-                error_label.config(text=f"Error: Shift {shift_name} not found.")
-                print("Error: Shift {shift_name} not found.")
-                continue
-            if shift["assigned_worker"] is not None:
-                error_label.config(text=f"Error: Shift {shift_name} already assigned.")
-                print("Error: Shift {shift_name} already assigned.")
-                continue
-            # Assign
-            shift["assigned_worker"] = name
-            successful_assigns += 1
-
-        if successful_assigns > 0:
-            # Update worker's range
-            original_min = worker["shifts_to_fill"][0]
-            original_max = worker["shifts_to_fill"][1]
-            new_min = max(0, original_min - successful_assigns)
-            new_max = max(0, original_max - successful_assigns)
-            worker["shifts_to_fill"] = [new_min, new_max]
-            range_entry.delete(0, END)
-            range_entry.insert(0, f"{new_min}-{new_max}")
-            error_label.config(text=f"Assigned {successful_assigns} manual shifts to {name}. Updated range to {new_min}-{new_max}.")
-            for shift in shifts_list:
-                print(shift)
-            for worker in workers_list:
-                print(worker)
-        else:
-            error_label.config(text="No shifts assigned.")
+    # Get selected shifts
+    manual_shifts = selected_manual_days.get(row_num, [])
+    if not manual_shifts:
+        error_label.config(text="No manual shifts selected.")
+        return
+
+    successful_assigns = 0
+    for shift_name in manual_shifts:
+        # Find the shift straight from the index (None if that shift wasn't made)
+        shift = shifts_by_name.get(shift_name)
+        if not shift:
+            error_label.config(text=f"Error: Shift {shift_name} not found.")
+            print("Error: Shift {shift_name} not found.")
+            continue
+        if shift["assigned_worker"] is not None:
+            error_label.config(text=f"Error: Shift {shift_name} already assigned.")
+            print("Error: Shift {shift_name} already assigned.")
+            continue
+        # Assign
+        shift["assigned_worker"] = name
+        shifts_by_worker_name.setdefault(name, []).append(shift)
+        successful_assigns += 1
+
+    if successful_assigns > 0:
+        # Update worker's range
+        original_min = worker["shifts_to_fill"][0]
+        original_max = worker["shifts_to_fill"][1]
+        new_min = max(0, original_min - successful_assigns)
+        new_max = max(0, original_max - successful_assigns)
+        worker["shifts_to_fill"] = [new_min, new_max]
+        row_widgets['range_var'].set(f"{new_min}-{new_max}")  # One call instead of delete + insert
+        error_label.config(text=f"Assigned {successful_assigns} manual shifts to {name}. Updated range to {new_min}-{new_max}.")
+        if DEBUG_PRINTS:
+            print("\n".join(map(str, shifts_list)))
+            print("\n".join(map(str, workers_list)))
+    else:
+        error_label.config(text="No shifts assigned.")
 
 def assign_all_manual_shifts():
     """
@@ -722,60 +809,48 @@ def assign_all_manual_shifts():
         manual_shifts = selected_manual_days.get(row_num, [])
         
         for shift_name in manual_shifts: # For example Day 2 Cardiology from Manual shifts ["Day 2 Cardiology", "Night 3 Internal Medicine"]
-            # Search through shifts_list to find the matching shift
-            for shift in shifts_list:
-                if shift["name"] == shift_name:
-                    # Only assign if not already taken
-                    if shift["assigned_worker"] is None:
-                        shift["assigned_worker"] = name
-                    else:
-                        print(f"Warning: {shift_name} already assigned to {shift['assigned_worker']}, skipping.")
-                    break  # Found the shift - no need to keep searching
+            # Find the matching shift straight from the index (None if that shift wasn't made)
+            shift = shifts_by_name.get(shift_name)
+            if shift is None:
+                continue
+            # Only assign if not already taken
+            if shift["assigned_worker"] is None:
+                shift["assigned_worker"] = name
+                shifts_by_worker_name.setdefault(name, []).append(shift)
+            else:
+                print(f"Warning: {shift_name} already assigned to {shift['assigned_worker']}, skipping.")
 
 def delete_row(row_num):
     # Find the worker's name before deleting
-    worker_name = None
-    global workers_list, shifts_list, worker_rows
-    for worker in workers_list:
-        if worker.get("worker_row_number") == row_num:
-            worker_name = worker["name"]
-            break
+    worker = workers_by_row.pop(row_num, None)
+    worker_name = worker["name"] if worker else None
 
-    # Unassign all shifts assigned to this worker
+    # Unassign all shifts assigned to this worker - only their own shifts, no need to scan all of shifts_list
     if worker_name:
-        for shift in shifts_list:
-            if shift["assigned_worker"] == worker_name:
-                shift["assigned_worker"] = None
+        for shift in shifts_by_worker_name.pop(worker_name, ()):
+            shift["assigned_worker"] = None
 
     # Clean up the dictionaries when deleting
-    if row_num in selected_cannot_days:
-        del selected_cannot_days[row_num]
-    if row_num in selected_prefer_days:
-        del selected_prefer_days[row_num]
-    if row_num in selected_units:
-        del selected_units[row_num]
-    if row_num in selected_manual_days:
-        del selected_manual_days[row_num]
-
-    # Find and destroy all widgets in this row
-    for row_widgets in worker_rows:
-        if row_widgets['row_num'] == row_num:
-            # Destroy each widget
-            for key, widget in row_widgets.items():
-                if key != 'row_num' and widget.winfo_exists():
-                    widget.destroy()
-            # Remove from worker_rows list
-            worker_rows.remove(row_widgets)
-            break
+    # .pop(key, None) removes the entry in one lookup and does nothing if it was never set
+    for per_row_dict in (selected_cannot_days, selected_prefer_days, selected_units, selected_manual_days):
+        per_row_dict.pop(row_num, None)
+
+    # Find and destroy all widgets in this row (and remove it from worker_rows)
+    row_widgets = worker_rows.pop(row_num, None)
+    if row_widgets:
+        for key, widget in row_widgets.items():
+            if key not in ('row_num', 'range_var') and widget.winfo_exists():
+                widget.destroy()
         '''
         The loop iterates over every key/value pair and destroys each one. The two conditions:
-        key != 'row_num' — skips the 'row_num' entry because it's a plain integer, not a widget. Calling .destroy() on an integer would crash.
+        key not in ('row_num', 'range_var') — skips the entries that aren't widgets: 'row_num' is a plain integer and 'range_var' is a StringVar. Calling .destroy() on them would crash.
         widget.winfo_exists() — checks the widget still exists in Tkinter before destroying it. This guards against a case where a widget may have already been destroyed (e.g. if its parent was destroyed first, children go with it).
         So together the two checks ensure: only destroy things that are actual live widgets.
         '''
 
-    # Remove the worker from workers_list if it exists
-    workers_list = [worker for worker in workers_list if worker.get("worker_row_number") != row_num]
+    # Remove the worker from workers_list if it exists (same dict object as in workers_by_row)
+    if worker:
+        workers_list.remove(worker)
     error_label.config(text=f"Worker '{worker_name}' deleted and all their shifts unassigned!")
 
 def open_pulp_settings():
@@ -795,11 +870,13 @@ def open_pulp_settings():
         "enforce_no_adj_nights":  enforce_no_adj_nights,
         "include_weekday_days":   include_weekday_days,
         "time_limit":             time_limit,
+        "gap_percent":            gap_percent,
     }
 
     def apply_new_settings(new_settings):
         global points_filled, points_preferred, points_preferred_unit, points_spacing
         global spacing_days_threshold, points_24hr, enforce_no_adj_days, enforce_no_adj_nights, include_weekday_days, time_limit
+        global gap_percent
         points_filled          = new_settings["points_filled"]
         points_preferred       = new_settings["points_preferred"]
         points_preferred_unit  = new_settings["points_preferred_unit"]
@@ -810,6 +887,7 @@ def open_pulp_settings():
         enforce_no_adj_nights  = new_settings["enforce_no_adj_nights"]
         include_weekday_days   = new_settings["include_weekday_days"]
         time_limit             = new_settings["time_limit"]
+        gap_percent            = new_settings["gap_percent"]
 
     pulp_settings(root, settings_inputs, error_label, apply_new_settings)
 
@@ -855,6 +933,7 @@ def load_preferences():
         },
         state={
             "workers_list": workers_list,
+            "workers_by_row": workers_by_row,
             "worker_rows": worker_rows,
             "selected_cannot_days": selected_cannot_days,
             "selected_prefer_days": selected_prefer_days,
@@ -863,6 +942,8 @@ def load_preferences():
             "holiday_days": holiday_days,
             "units_list": units_list,
             "shifts_list": shifts_list,
+            "shifts_by_name": shifts_by_name,
+            "shifts_by_worker_name": shifts_by_worker_name,
         },
         callbacks={
             "save_month": save_month,
@@ -892,6 +973,7 @@ def load_xlsx_preferences():
         },
         state={
             "workers_list": workers_list,
+            "workers_by_row": workers_by_row,
             "worker_rows": worker_rows,
             "selected_cannot_days": selected_cannot_days,
             "selected_prefer_days": selected_prefer_days,
@@ -910,22 +992,6 @@ def load_xlsx_preferences():
         global worker_row_number
         worker_row_number = result["worker_row_number"]
 
-def extract_day_from_shift_name(shift_name):
-    """
-    Extract day number from shift name.
-    Examples: "Day 5 Cardiology" -> 5, "Night 12 Internal Medicine" -> 12
-    """
-    parts = shift_name.split()
-    return int(parts[1])  # Day number is always the second part
-
-def extract_unit_from_shift_name(shift_name):
-    """
-    Extract unit name from shift name.
-    Examples: "Day 5 Cardiology" -> "Cardiology"
-    """
-    parts = shift_name.split()
-    return " ".join(parts[2:])  # Everything after day number is the unit
-
 def format_elapsed_time(seconds):
     minutes = int(seconds // 60)
     secs = int(seconds % 60)
@@ -937,6 +1003,28 @@ def format_elapsed_time(seconds):
 # PuLP Solve: solver is in separate file
 # ----------------------------------------------------------------------------
 
+# One solver thread for the whole app, started once and reused for every solve.
+# create_rota() puts a job (a function to call) in solver_jobs, and the thread runs the jobs one at a time.
+# daemon=True means: if the user closes the window,
+# don't let this thread keep Python alive in the background
+solver_jobs = queue.Queue()
+
+def solver_worker():
+    while True:
+        job = solver_jobs.get()  # Waits here (without using CPU) until a job arrives
+        try:
+            job()
+        except Exception as e:
+            # A job that crashes must not take this thread down with it - every later
+            # Create Rota would queue a job nobody runs, and the buttons would stay greyed out
+            print(f"Solver job failed: {e}")
+            try:
+                root.after(0, reset_after_failed_solve, f"Solver stopped: {e}")
+            except (RuntimeError, TclError):
+                pass  # The window is already closing - nothing left to reset
+
+threading.Thread(target=solver_worker, daemon=True).start()
+
 def set_solving_state(is_solving):
     """
     Disable or enable buttons while the solver is running.
@@ -962,10 +1050,21 @@ def set_solving_state(is_solving):
 
     # Also disable all Save, Delete, Cannot, Prefer etc. buttons
     # on every worker row — these all touch workers_list
-    for row_widgets in worker_rows:
-        for key, widget in row_widgets.items():
-            if key != 'row_num':
-                widget.config(state=state)
+    # Every .config() is a separate trip into Tcl, so collect the widget names (like ".!frame.!entry2")
+    # and let Tcl's own foreach loop set them all in ONE call.
+    row_widget_names = [str(widget)
+                        for row_widgets in worker_rows.values()
+                        for key, widget in row_widgets.items()
+                        if key not in ('row_num', 'range_var')]  # Not widgets
+    if row_widget_names:
+        root.tk.call("foreach", "w", row_widget_names, f"$w configure -state {state}")
+
+def reset_after_failed_solve(message):
+    """Give the window back after a solver job crashed outside its own error handling (see solver_worker)."""
+    solving_progressbar.stop()
+    solving_progressbar.pack_forget()
+    set_solving_state(False)
+    error_label.config(text=message)
 
 
 def create_rota():
@@ -989,6 +1088,10 @@ def create_rota():
     
     assign_all_manual_shifts()  # Lock in manual assignments before solver runs
 
+    # The solver thread reads its own copy of the shift index: Load / Load .xlsx stay usable during
+    # a solve and rebuild shifts_by_name through make_shifts(), which could swap in another month mid-solve
+    shifts_snapshot = dict(shifts_by_name)
+
     # LOCK everything down immediately
     set_solving_state(True)
     # ========================================================================
@@ -1006,54 +1109,79 @@ def create_rota():
         "enforce_no_adj_days": enforce_no_adj_days,
         "points_preferred_unit": points_preferred_unit,
         "time_limit": time_limit,                        
+        "gap_percent": gap_percent,
     }
     # -------------------------------------------------------
-    # PART 1: The animated dots
+    # PART 1: The "Solving..." progress bar
     # -------------------------------------------------------
-    # This list holds one item: the current dot count (0, 1, 2, or 3)
-    # We use a list instead of a plain variable because of how Python
-    # handles variables inside nested functions.
-    #
-    # WHY A LIST? If we wrote: dot_count = 0, then tried to do
-    # dot_count += 1 inside animate(), Python would complain
-    # "dot_count not defined" — because inner functions can READ
-    # outer variables but can't REASSIGN them (without 'nonlocal').
-    # A list gets around this: we never reassign dot_count itself,
-    # we just change what's inside it: dot_count[0] += 1
-    dot_count = [0]
-
-    def animate():
-        # dot_count[0] cycles: 0 → 1 → 2 → 3 → 0 → 1 → ...
-        dot_count[0] = (dot_count[0] + 1) % 4  # % 4 means "wrap back to 0 after 3"
-        dots = "." * dot_count[0]               # 0 dots, 1 dot, 2 dots, or 3 dots
-        error_label.config(text=f"Solving rota{dots}")
-
-        # root.after(milliseconds, function) is Tkinter's way of saying
-        # "call this function again after X milliseconds — but only if
-        # the solver is still running"
-        # We store the "job ID" so we can cancel it later
-        if not solver_done[0]:  # solver_done is explained below
-            animate_job[0] = root.after(500, animate)  # 500ms = half a second
+    # solving_progressbar (made once, next to error_label) animates itself inside Tk once started,
+    # so no Python function has to wake up every half second to move it.
+    def stop_progress():
+        solving_progressbar.stop()
+        solving_progressbar.pack_forget()  # Hide it again until the next solve
 
     # -------------------------------------------------------
-    # PART 2: Flags to track if the solver has finished
+    # PART 2: State shared with the solver thread
     # -------------------------------------------------------
-    # Same list trick as above — used to communicate between threads
-    solver_done = [False]    # Becomes True when solver finishes
-    animate_job = [None]     # Stores the root.after job ID so we can cancel it
-    result_holder = [None]   # Will store (assignments, summary) when done
-    start_time = [None]      # Will store when solving began
+    # solve_state holds everything the nested functions below share, including across threads.
+    #
+    # WHY A NAMESPACE? If we wrote: result = None, then tried to do
+    # result = (...) inside run_solver(), Python would just make a new
+    # local variable there — because inner functions can READ
+    # outer variables but can't REASSIGN them (without 'nonlocal').
+    # A SimpleNamespace gets around this: we never reassign solve_state itself,
+    # we just change its attributes: solve_state.result = (...)
+    solve_state = SimpleNamespace(
+        result=None,        # Will store (assignments, summary, unit_rows) when done
+        start_time=None,    # Will store when solving began
+    )
 
     # -------------------------------------------------------
     # PART 3: The solver function that runs in the background
     # -------------------------------------------------------
     def run_solver():
         # This whole function runs on a SEPARATE thread
-        # so Tkinter stays free to animate
+        # so Tkinter stays free to redraw (and animate the progress bar)
         try:
+            # Imported here instead of at the top: solver.py loads PuLP, which is slow to import,
+            # so the window opens faster and the cost is only paid (once) on the first solve, off the GUI thread
+            from solver import solve_rota # bring PuLP solver from another file
             assignments, summary = solve_rota(shifts_list, workers_list, units_list, settings)
-            result_holder[0] = (assignments, summary)
-            solver_done[0] = True
+
+            # Infeasible / nothing to assign → on_solver_finished only shows a message, no popup,
+            # so skip building the tables for it.
+            unit_rows = {}
+            if summary["status"] not in ("Infeasible", "Nothing to assign"):
+                # Group and format the results HERE, still on the background thread,
+                # so on_solver_finished only has to put ready-made text into the popup.
+                """
+                Below a dictionary is built for assignments_by_unit = {
+                "ICU": {
+                    5:  {"Day": "Dr. Smith", "Night": "Dr. Jones"},
+                    12: {"Day": "Unassigned", "Night": "Dr. Smith"},
+                    ...},
+                "Internal Medicine": {
+                    2: {"Day": "Bobby", "Night": "Dr. Brown"} 
+                    ...},
+                }
+                """
+                # defaultdict builds the missing levels by itself: a new unit gets an empty {day: ...} dict, and a new day
+                # starts as {"Day": "No shift", "Night": "No shift"} - so no "if ... not in" checks are needed.
+                assignments_by_unit = defaultdict(lambda: defaultdict(lambda: {"Day": "No shift", "Night": "No shift"}))
+                for shift_name, worker in assignments.items():
+                    # make_shifts() already stored the unit, day and type on each shift - look them up instead of splitting the name
+                    shift = shifts_snapshot[shift_name]
+                    # "Unassigned" overwrites "No shift" only if the solver did not find a worker. If the shift did not even exist, the day keeps "No shift".
+                    assignments_by_unit[shift["unit"]][shift["day"]][shift["type"]] = worker or "Unassigned"
+
+                # One finished table line per day, units A-Z and days in order, so the GUI thread doesn't sort anything:
+                # unit_rows = {"ICU": ["5      Dr. Smith     Dr. Jones\n", "12     Unassigned    Dr. Smith\n", ...], ...}
+                # (dicts keep the order keys were added in)
+                for unit in sorted(assignments_by_unit):
+                    days = assignments_by_unit[unit]
+                    unit_rows[unit] = [RESULTS_ROW_FORMAT(day, days[day]['Day'], days[day]['Night']) for day in sorted(days)]
+
+            solve_state.result = (assignments, summary, unit_rows)
             root.after(0, on_solver_finished)
 
         except Exception as e:
@@ -1063,34 +1191,36 @@ def create_rota():
             # WHY CHECK winfo_exists()?
             # If the window is already destroyed (user closed it), trying to
             # update the label would cause a second crash. So we check first.
-            solver_done[0] = True  # Stop the animation either way
+            # Build the message now: Python deletes 'e' when the except block ends,
+            # and show_error() only runs later on the GUI thread
+            error_message = f"Solver stopped: {str(e)}"
             if root.winfo_exists():
                 def show_error():
                     set_solving_state(False)
-                    if animate_job[0] is not None:
-                        root.after_cancel(animate_job[0])
-                    error_label.config(text=f"Solver stopped: {str(e)}")
+                    stop_progress()
+                    error_label.config(text=error_message)
                 root.after(0, show_error)
     # -------------------------------------------------------
     # PART 4: What happens when the solver finishes
     # -------------------------------------------------------
     def on_solver_finished():
-        # Cancel any pending animation call
-        if animate_job[0] is not None:
-            root.after_cancel(animate_job[0])
+        # Stop and hide the progress bar
+        stop_progress()
 
         # RE-ENABLE everything now that solving is done
         set_solving_state(False)
 
-        # Unpack the results
-        assignments, summary = result_holder[0]
+        # Unpack the results (unit_rows was already built on the solver thread)
+        assignments, summary, unit_rows = solve_state.result
 
         # Everything below is exactly your original create_rota code
         # — just moved here so it runs after the solver is done
 
-        print("Final Rota:")
-        for shift_name, worker in assignments.items():
-            print(f"{shift_name}: {worker if worker else 'Unassigned'}")
+        # Full assignment dump only when debugging, and as one print call (hundreds of lines otherwise)
+        if DEBUG_PRINTS:
+            print("Final Rota:\n" + "\n".join(
+                f"{shift_name}: {worker if worker else 'Unassigned'}"
+                for shift_name, worker in assignments.items()))
 
         if summary["status"] == "Infeasible":
             error_label.config(text="ERROR: Impossible to create rota with current rules! Check shift ranges, max weekends, max 24hr shifts.")
@@ -1112,78 +1242,61 @@ def create_rota():
 
         def on_popup_mousewheel(event):
             text_widget.yview_scroll(int(-1 * (event.delta / 120)), "units")
+            return "break"  # Handled - don't let the Text class / popup bindings scroll it again
 
-        popup.bind("<MouseWheel>", on_popup_mousewheel)
+        # Bound on the Text widget only. A wheel event over the text also reaches the popup's own bindings,
+        # so binding both used to run the handler twice per tick.
         text_widget.bind("<MouseWheel>", on_popup_mousewheel)
 
-        text_widget.insert("end", "Final Rota (Multi-Unit)\n", "title")
-        text_widget.insert("end", "=" * 70 + "\n\n", "separator")
-
-        """
-        Below a dictionary is built for assignments_by_unit = {
-        "ICU": {
-            5:  {"Day": "Dr. Smith", "Night": "Dr. Jones"},
-            12: {"Day": "Unassigned", "Night": "Dr. Smith"},
-            ...},
-        "Internal Medicine": {
-            2: {"Day": "Bobby", "Night": "Dr. Brown"} 
-            ...},
-        }
-        """
-        assignments_by_unit = {}
-        for shift_name, worker in assignments.items():
-            if worker is None:
-                worker = "Unassigned" # Later "No shift" is overwritten -> to "Unassigned", but only if the solver did not find a worker. If the shift did not even exist, it remains as "No shift", which is written as default for every day (1, 2...) below.
-            unit = extract_unit_from_shift_name(shift_name)
-            if unit not in assignments_by_unit:
-                assignments_by_unit[unit] = {}
-            day = extract_day_from_shift_name(shift_name)
-            shift_type = shift_name.split()[0]
-            if day not in assignments_by_unit[unit]:
-                assignments_by_unit[unit][day] = {"Day": "No shift", "Night": "No shift"} # First builds a "No shift", so it can be filled by a worker later.
-            assignments_by_unit[unit][day][shift_type] = worker # Here "Unassigned" could overwrite "No shift", or a specific worker like "Dr. Brown" overwrites "No shift"
-
-        for unit in sorted(assignments_by_unit.keys()):
-            text_widget.insert("end", f"=== {unit} ===\n", "unit_header")
-            text_widget.insert("end", "-" * 70 + "\n", "separator")
-            text_widget.insert("end", f"{'Day':<7}{'Day Shift':<30}{'Night Shift':<30}\n", "header")
-            text_widget.insert("end", "-" * 70 + "\n", "separator")
-            for day in sorted(assignments_by_unit[unit].keys()):
-                day_worker = assignments_by_unit[unit][day].get("Day", "No shift")
-                night_worker = assignments_by_unit[unit][day].get("Night", "No shift")
-                text_widget.insert("end", f"{day:<7}{day_worker:<30}{night_worker:<30}\n")
-            text_widget.insert("end", "\n")
-
-        text_widget.insert("end", "=" * 70 + "\n", "separator")
-        text_widget.insert("end", "Summary:\n", "title")
-        text_widget.insert("end", "-" * 70 + "\n", "separator")
-        text_widget.insert("end", f"Number of preferred shifts assigned: {summary['preferences_count']}\n")
-        text_widget.insert("end", f"Number of 24-hour shifts: {summary['twenty_four_count']}\n")
-        text_widget.insert("end", f"Number of bad spacing pairs (<{spacing_days_threshold} days apart): {summary['bad_spacing_count']}\n")
-        text_widget.insert("end", f"Number of shifts in non-preferred units (workers with preference only): {summary['non_preferred_unit_count']}\n")
-
-        text_widget.tag_config("title", font=("Courier", 12, "bold"))
-        text_widget.tag_config("unit_header", font=("Courier", 11, "bold"), foreground="blue")
-        text_widget.tag_config("header", font=("Courier", 10, "bold"))
+        # Collect the whole report first, then give it to the Text widget in ONE insert call.
+        # Text.insert accepts several text/tags pairs: insert("end", text1, tags1, text2, tags2, ...)
+        report = []
+        def add(text, tags=()):  # () = no tag
+            report.extend((text, tags))
+
+        add("Final Rota (Multi-Unit)\n", "title")
+        add(RESULTS_THICK_LINE + "\n", "separator")
+
+        for unit, rows in unit_rows.items():  # Already sorted on the solver thread
+            add(f"=== {unit} ===\n", "unit_header")
+            add(RESULTS_THIN_LINE, "separator")
+            add(RESULTS_COLUMN_HEADER, "header")
+            add(RESULTS_THIN_LINE, "separator")
+            for row in rows:
+                add(row)  # Already formatted on the solver thread
+            add("\n")
+
+        add(RESULTS_THICK_LINE, "separator")
+        add("Summary:\n", "title")
+        add(RESULTS_THIN_LINE, "separator")
+        add(f"Solver status: {summary['status']}\n")  # e.g. "Optimal" or "Within 1% of best"
+        add(f"Number of preferred shifts assigned: {summary['preferences_count']}\n")
+        add(f"Number of 24-hour shifts: {summary['twenty_four_count']}\n")
+        add(f"Number of bad spacing pairs (<{spacing_days_threshold} days apart): {summary['bad_spacing_count']}\n")
+        add(f"Number of shifts in non-preferred units (workers with preference only): {summary['non_preferred_unit_count']}\n")
+        text_widget.insert("end", *report)  # One Tk call for the whole report
+
+        text_widget.tag_config("title", font=RESULTS_TITLE_FONT)
+        text_widget.tag_config("unit_header", font=RESULTS_UNIT_FONT, foreground="blue")
+        text_widget.tag_config("header", font=RESULTS_HEADER_FONT)
         text_widget.tag_config("separator", foreground="gray")
 
         text_widget.config(state="disabled")
 
-        elapsed = time.time() - start_time[0]
+        elapsed = time.time() - solve_state.start_time
         error_label.config(text=f"Rota finished in {format_elapsed_time(elapsed)}! See the popup window for results.")
 
     # -------------------------------------------------------
     # PART 5: Kick everything off
     # -------------------------------------------------------
-    # Start the animation immediately
-    start_time[0] = time.time()  # Record the moment solving begins animate()
-    animate()
+    # Show the progress bar immediately
+    solve_state.start_time = time.time()  # Record the moment solving begins
+    error_label.config(text="Solving rota...")
+    solving_progressbar.pack(pady=(0, 4))
+    solving_progressbar.start(50)  # Move the bar every 50 ms - Tk does this by itself
 
-    # Start the solver on a background thread
-    # daemon=True means: if the user closes the window,
-    # don't let this thread keep Python alive in the background
-    solver_thread = threading.Thread(target=run_solver, daemon=True)
-    solver_thread.start()
+    # Hand the solve to the background solver thread (see solver_worker)
+    solver_jobs.put(run_solver)
 
 # ---------------------------------------------------------------
 # Small code area mainly for buttons and error sign at the bottom
@@ -1208,6 +1321,9 @@ Button(utilities_lf, text="Load .xlsx",       width=16, command=load_xlsx_prefer
 error_label = Label(root, text="")  # For errors.
 error_label.pack()
 
+# Shown under error_label only while the solver runs (create_rota packs it, stop_progress hides it)
+solving_progressbar = ttk.Progressbar(root, mode="indeterminate", length=200)
+
 def on_closing():
     """
     This runs when the user clicks the X to close the window.
@@ -1218,7 +1334,8 @@ def on_closing():
     We need to manually find and kill them.
     
     psutil lets us find all child processes of our own Python process
-    and kill them before we exit. Subprocess let's also kill the whole tree.
+    (recursive=True = children, their children etc., so the whole tree)
+    and kill them before we exit.
     """
     try:
         current_process = psutil.Process(os.getpid())
@@ -1227,21 +1344,15 @@ def on_closing():
         for child in children:
             try:
                 print(f"Killing child process: {child.name()} (PID {child.pid})")
-
-                # /F = force kill, /T = kill the whole tree including conhost.exe
-                subprocess.call(
-                    ['taskkill', '/F', '/T', '/PID', str(child.pid)],
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-
+                # Kill it directly (TerminateProcess on Windows, SIGKILL on macOS/Linux).
+                # The list already holds the whole tree (cbc.exe, conhost.exe...), so there is
+                # no need to start a separate taskkill process for every child.
+                child.kill()
             except psutil.NoSuchProcess:
-                pass
-            except Exception:
-                # Fallback for macOS/Linux where taskkill doesn't exist
-                try:
-                    child.kill()
-                except psutil.NoSuchProcess:
-                    pass
+                pass  # Already gone (e.g. its parent was killed first)
+            except psutil.Error as e:
+                # e.g. AccessDenied - report it and carry on, so the other children still get killed
+                print(f"Could not kill child process (PID {child.pid}): {e}")
 
     except Exception as e:
         print(f"Cleanup error: {e}")
@@ -11,86 +11,58 @@ def pulp_settings(root, settings_inputs, error_label, on_save):
         on_save         - callback function called with the new settings dict when Save is clicked
     """
 
-    # Unpack the settings dictionary into local variables
-    points_filled         = settings_inputs["points_filled"]
-    points_preferred      = settings_inputs["points_preferred"]
-    points_preferred_unit = settings_inputs["points_preferred_unit"]
-    points_spacing        = settings_inputs["points_spacing"]
-    spacing_days_threshold = settings_inputs["spacing_days_threshold"]
-    points_24hr           = settings_inputs["points_24hr"]
-    enforce_no_adj_days   = settings_inputs["enforce_no_adj_days"]
-    enforce_no_adj_nights = settings_inputs["enforce_no_adj_nights"]
-    include_weekday_days  = settings_inputs["include_weekday_days"]
-    time_limit            = settings_inputs["time_limit"]
-    
     popup = Toplevel(root)
     popup.title("PuLP Settings")
 
-    Label(popup, text="Points for shifts filled:").grid(row=0, column=0, sticky="w")
-    filled_entry = Entry(popup)
-    filled_entry.insert(0, str(points_filled))
-    filled_entry.grid(row=0, column=1)
+    # Every setting on the form: (label text, settings key). Number boxes first, then tick boxes.
+    # The form is built from these lists, and save_settings reads the values back with the same keys.
+    # Number boxes also say how to read them: whole numbers, except the gap, which can be e.g. 0.5
+    number_fields = [
+        ("Points for shifts filled:",       "points_filled",          int),
+        ("Points for preferred shifts:",    "points_preferred",       int),
+        ("Points for preferred units:",     "points_preferred_unit",  int),
+        ("Points for bad spacing days:",    "points_spacing",         int),
+        ("Days apart for spacing penalty:", "spacing_days_threshold", int),
+        ("Points for 24-hour shifts:",      "points_24hr",            int),
+        ("Time limit (seconds):",           "time_limit",             int),
+        ("Accepted gap from best (%):",     "gap_percent",            float),
+    ]
+    checkbox_fields = [
+        ("Enforce: No Day → Day",      "enforce_no_adj_days"),
+        ("Enforce: No Night → Night",  "enforce_no_adj_nights"),
+        ("Include Mon-Fri day shifts", "include_weekday_days"),
+    ]
 
-    Label(popup, text="Points for preferred shifts:").grid(row=1, column=0, sticky="w")
-    preferred_entry = Entry(popup)
-    preferred_entry.insert(0, str(points_preferred))
-    preferred_entry.grid(row=1, column=1)
+    fields = []  # (settings key, Entry or IntVar, how to convert its .get() value) - one per row
 
-    Label(popup, text="Points for preferred units:").grid(row=2, column=0, sticky="w")
-    preferred_unit_entry = Entry(popup)
-    preferred_unit_entry.insert(0, str(points_preferred_unit))
-    preferred_unit_entry.grid(row=2, column=1)
+    for row, (label_text, key, convert) in enumerate(number_fields):
+        Label(popup, text=label_text).grid(row=row, column=0, sticky="w")
+        entry = Entry(popup)
+        entry.insert(0, str(settings_inputs[key]))
+        entry.grid(row=row, column=1)
+        fields.append((key, entry, convert))
 
-    Label(popup, text="Points for bad spacing days:").grid(row=3, column=0, sticky="w")
-    spacing_entry = Entry(popup)
-    spacing_entry.insert(0, str(points_spacing))
-    spacing_entry.grid(row=3, column=1)
-
-    Label(popup, text="Days apart for spacing penalty:").grid(row=4, column=0, sticky="w")
-    spacing_days_entry = Entry(popup)
-    spacing_days_entry.insert(0, str(spacing_days_threshold))
-    spacing_days_entry.grid(row=4, column=1)
-
-    Label(popup, text="Points for 24-hour shifts:").grid(row=5, column=0, sticky="w")
-    hr24_entry = Entry(popup)
-    hr24_entry.insert(0, str(points_24hr))
-    hr24_entry.grid(row=5, column=1)
-
-    Label(popup, text="Time limit (seconds):").grid(row=6, column=0, sticky="w")
-    time_limit_entry = Entry(popup)
-    time_limit_entry.insert(0, str(time_limit))
-    time_limit_entry.grid(row=6, column=1)
-
-    Label(popup, text="Enforce: No Day → Day").grid(row=7, column=0, sticky="w")
-    adj_days_var = IntVar(value=1 if enforce_no_adj_days else 0)
-    Checkbutton(popup, variable=adj_days_var).grid(row=7, column=1)
-
-    Label(popup, text="Enforce: No Night → Night").grid(row=8, column=0, sticky="w")
-    adj_nights_var = IntVar(value=1 if enforce_no_adj_nights else 0)
-    Checkbutton(popup, variable=adj_nights_var).grid(row=8, column=1)
-
-    Label(popup, text="Include Mon-Fri day shifts").grid(row=9, column=0, sticky="w")
-    include_weekday_var = IntVar(value=1 if include_weekday_days else 0)
-    Checkbutton(popup, variable=include_weekday_var).grid(row=9, column=1)
+    for row, (label_text, key) in enumerate(checkbox_fields, start=len(number_fields)):
+        Label(popup, text=label_text).grid(row=row, column=0, sticky="w")
+        var = IntVar(value=1 if settings_inputs[key] else 0)
+        Checkbutton(popup, variable=var).grid(row=row, column=1)
+        fields.append((key, var, bool))
 
     def save_settings():
-        try:
-            new_settings = {
-                    "points_filled":          int(filled_entry.get()),
-                    "points_preferred":       int(preferred_entry.get()),
-                    "points_preferred_unit":  int(preferred_unit_entry.get()),
-                    "points_spacing":         int(spacing_entry.get()),
-                    "spacing_days_threshold": int(spacing_days_entry.get()),
-                    "points_24hr":            int(hr24_entry.get()),
-                    "enforce_no_adj_days":    bool(adj_days_var.get()),
-                    "enforce_no_adj_nights":  bool(adj_nights_var.get()),
-                    "include_weekday_days":   bool(include_weekday_var.get()),
-                    "time_limit":             int(time_limit_entry.get()),
-                }
-            on_save(new_settings)  # send values back to hospital_rota_app.py
-            error_label.config(text="PuLP settings updated successfully!")
-            popup.destroy()
-        except ValueError:
-            error_label.config(text="Error: All values must be integers.")
+        new_settings = {}
+        for key, widget, convert in fields:  # One loop over the whole form
+            try:
+                new_settings[key] = convert(widget.get())
+            except ValueError:
+                error_label.config(text=f"Error: All values must be numbers - whole numbers except the gap ({key} isn't).")
+                return
+        # CBC takes the gap as a fraction of the best rota, so it has to be 0-100%.
+        # (Written as "0 <= gap <= 100" so that nan and inf fail the check too.)
+        if not 0 <= new_settings["gap_percent"] <= 100:
+            error_label.config(text="Error: Accepted gap from best must be between 0 and 100 (%).")
+            return
+        on_save(new_settings)  # send values back to hospital_rota_app.py
+        error_label.config(text="PuLP settings updated successfully!")
+        popup.destroy()
 
-    Button(popup, text="Save Settings", command=save_settings).grid(row=10, column=0, columnspan=2)
+    Button(popup, text="Save Settings", command=save_settings).grid(row=len(fields), column=0, columnspan=2)
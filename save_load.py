@@ -1,7 +1,22 @@
 import json
 import openpyxl
+try:
+    import orjson  # Optional, faster JSON reader/writer (pip install orjson). Without it the json module is used.
+except ImportError:
+    orjson = None
 import ast
-from tkinter import filedialog, END
+from functools import lru_cache
+from tkinter import filedialog, END, TclError
+from date_settings import MONTH_NAMES  # Shared month names, so loading doesn't rebuild the list every time
+
+# Set to True to dump the loaded state to the console after loading a preferences file
+DEBUG_PRINTS = False
+
+# Button text for a "Select" button: "Select" when nothing is picked, "Select (4)" otherwise.
+# Only a handful of different counts ever show up, so each text is built once and reused.
+@lru_cache(maxsize=64)
+def select_label(count):
+    return f"Select ({count})" if count > 0 else "Select"
 
 def save_preferences(error_label, state):
     
@@ -30,16 +45,21 @@ def save_preferences(error_label, state):
     if file_path:
         # Clean up the dictionaries before saving
         # Get a set of row numbers that actually have saved workers
-        saved_row_numbers = set()  # Like a basket to collect valid table numbers, it gives every row_num an id, so when looking for it below "if row_num in saved_row_numbers" it finds it instantly
-        for worker in workers_list:  # Loop through all saved workers
-            saved_row_numbers.add(worker["worker_row_number"])  # Add their table number
+        # Like a basket to collect valid table numbers, it gives every row_num an id, so when looking for it below "if row_num in saved_row_numbers" it finds it instantly
+        saved_row_numbers = frozenset(worker["worker_row_number"] for worker in workers_list)  # One table number per saved worker
         
         # Filter the dictionaries to only keep entries for saved workers
         # This is like throwing away notes from empty tables
-        cleaned_cannot = {row_num: days for row_num, days in selected_cannot_days.items() if row_num in saved_row_numbers}
-        cleaned_prefer = {row_num: days for row_num, days in selected_prefer_days.items() if row_num in saved_row_numbers}
-        cleaned_selected_units = {row_num: days for row_num, days in selected_units.items() if row_num in saved_row_numbers}
-        cleaned_manual = {row_num: days for row_num, days in selected_manual_days.items() if row_num in saved_row_numbers}
+        # One pass over the saved workers fills all four cleaned dicts, instead of four separate passes
+        cleaned_cannot, cleaned_prefer, cleaned_selected_units, cleaned_manual = {}, {}, {}, {}
+        source_and_cleaned = ((selected_cannot_days, cleaned_cannot),
+                              (selected_prefer_days, cleaned_prefer),
+                              (selected_units,       cleaned_selected_units),
+                              (selected_manual_days, cleaned_manual))
+        for row_num in saved_row_numbers:
+            for source, cleaned in source_and_cleaned:
+                if row_num in source:  # Only copy what this worker actually picked, same as before
+                    cleaned[row_num] = source[row_num]
         
         # Build the data to save (using cleaned versions)
         data = {"year": year}
@@ -53,8 +73,17 @@ def save_preferences(error_label, state):
         data["selected_manual_days"] = cleaned_manual  # Use cleaned version
         data["units_list"] = units_list  # Save units_list
         
-        with open(file_path, 'w') as f:
-            json.dump(data, f)
+        if orjson is not None:
+            # orjson writes bytes straight from C. OPT_NON_STR_KEYS turns the row_num int keys into
+            # strings, the same as json.dump does, so the file loads back exactly the same way.
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            # json.dumps builds the whole text in one go (C encoder) and it is written with one call.
+            # json.dump(data, f) would call f.write() once for every little piece of the file.
+            payload = json.dumps(data)
+            with open(file_path, 'w') as f:
+                f.write(payload)
         error_label.config(text="Preferences saved.")
 
 def load_preferences(widgets, state, callbacks):
@@ -77,7 +106,8 @@ def load_preferences(widgets, state, callbacks):
             Lists and dicts are modified in-place, so changes here
             automatically reflect in hospital_rota_app.py. Keys:
             - "workers_list"         : list of worker dictionaries
-            - "worker_rows"          : list of GUI row widget dicts
+            - "workers_by_row"       : dict {row_num: worker dict}, index into workers_list
+            - "worker_rows"          : dict {row_num: GUI row widget dict}
             - "selected_cannot_days" : dict {row_num: [shift strings]}
             - "selected_prefer_days" : dict {row_num: [shift strings]}
             - "selected_units"       : dict {row_num: [unit strings]}
@@ -85,6 +115,8 @@ def load_preferences(widgets, state, callbacks):
             - "holiday_days"         : list of holiday day numbers
             - "units_list"           : list of unit name strings
             - "shifts_list"          : list of shift dictionaries
+            - "shifts_by_name"       : dict {shift name: shift dict}, index into shifts_list
+            - "shifts_by_worker_name": dict {worker name: [assigned shift dicts]}
 
         callbacks (dict): Functions from the main file. Keys:
             - "save_month"            : recalculates days_list after month loads
@@ -110,6 +142,7 @@ def load_preferences(widgets, state, callbacks):
 
     # Unpack mutable state (lists/dicts — modified in-place, no need to return them)
     workers_list        = state["workers_list"]
+    workers_by_row      = state["workers_by_row"]
     worker_rows         = state["worker_rows"]
     selected_cannot_days = state["selected_cannot_days"]
     selected_prefer_days = state["selected_prefer_days"]
@@ -118,6 +151,8 @@ def load_preferences(widgets, state, callbacks):
     holiday_days        = state["holiday_days"]
     units_list          = state["units_list"]
     shifts_list         = state["shifts_list"]
+    shifts_by_name      = state["shifts_by_name"]
+    shifts_by_worker_name = state["shifts_by_worker_name"]
 
     # Unpack callbacks
     save_month            = callbacks["save_month"]
@@ -135,8 +170,13 @@ def load_preferences(widgets, state, callbacks):
     if not file_path:
         return None  # User clicked Cancel — nothing to update
 
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(file_path, 'rb') as f:  # orjson reads the raw UTF-8 bytes itself
+            data = orjson.loads(f.read())
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:  # orjson saves names as UTF-8 (json.dump files are plain ASCII)
+            data = json.load(f)
+    # Either way JSON object keys come back as strings, so the row_num keys are still turned back into ints below
 
     if "year" in data:
         year = data["year"]
@@ -149,8 +189,7 @@ def load_preferences(widgets, state, callbacks):
         set_month(month)                        # ← add this line
         month_entry.delete(0, END)
         month_entry.insert(0, str(month))
-        month_name_list = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-        month_name = month_name_list[month-1]
+        month_name = MONTH_NAMES[month]  # MONTH_NAMES[1] = "January"
         current_month_label.config(text="Current Month: " + month_name)
         save_month()
     if "holiday_days" in data:
@@ -175,44 +214,50 @@ def load_preferences(widgets, state, callbacks):
     if "shifts_list" in data:
         shifts_list.clear()
         shifts_list.extend(data["shifts_list"])
+        shifts_by_name.clear()
+        shifts_by_name.update({shift["name"]: shift for shift in shifts_list})
+        shifts_by_worker_name.clear()
+        for shift in shifts_list:
+            if shift.get("assigned_worker") is not None:
+                shifts_by_worker_name.setdefault(shift["assigned_worker"], []).append(shift)
     if "workers_list" in data:
         workers_list.clear()
         workers_list.extend(data["workers_list"])
+        workers_by_row.clear()
+        workers_by_row.update({worker["worker_row_number"]: worker for worker in workers_list})
         if "selected_cannot_days" not in data:
             selected_cannot_days.clear()
             selected_cannot_days.update({worker["worker_row_number"]: worker.get("cannot_work", []) for worker in workers_list})
         # Clear existing worker rows
-        for row_widgets in worker_rows:
+        for row_widgets in worker_rows.values():
             for key, widget in row_widgets.items():
-                if key != 'row_num' and widget.winfo_exists():
-                    widget.destroy()
+                if key not in ('row_num', 'range_var'):
+                    try:
+                        widget.destroy()
+                    except TclError:  # Already gone - nothing to clean up
+                        pass
         worker_rows.clear()
         worker_row_number = 1
+        max_row = 0  # Biggest row number seen so far, tracked while the rows are added
         # Now add rows for loaded workers
         for worker in workers_list:
             row_num = worker["worker_row_number"]
             set_worker_row_number(row_num)  # sets global in main file so add_worker_row uses correct number
             add_worker_row()
+            if row_num > max_row:
+                max_row = row_num
         # Now populate the entries
         for worker in workers_list:
-            row_num = worker["worker_row_number"]
-            for rw in worker_rows:
-                if rw['row_num'] == row_num:
-                    rw['name_entry'].delete(0, END)
-                    rw['name_entry'].insert(0, worker["name"])
-                    rw['range_entry'].delete(0, END)
-                    rw['range_entry'].insert(0, f"{worker['shifts_to_fill'][0]}-{worker['shifts_to_fill'][1]}")
-                    rw['max_weekends_entry'].delete(0, END)
-                    rw['max_weekends_entry'].insert(0, str(worker["max_weekends"]))
-                    rw['max_24hr_entry'].delete(0, END)
-                    rw['max_24hr_entry'].insert(0, str(worker["max_24hr"]))
-                    break
-        # Update worker_row_number to max +1
-        if workers_list:
-            max_row = max(worker["worker_row_number"] for worker in workers_list)
-            worker_row_number = max_row + 1
-        else:
-            worker_row_number = 1
+            rw = worker_rows[worker["worker_row_number"]]
+            rw['name_entry'].delete(0, END)
+            rw['name_entry'].insert(0, worker["name"])
+            rw['range_var'].set(f"{worker['shifts_to_fill'][0]}-{worker['shifts_to_fill'][1]}")
+            rw['max_weekends_entry'].delete(0, END)
+            rw['max_weekends_entry'].insert(0, str(worker["max_weekends"]))
+            rw['max_24hr_entry'].delete(0, END)
+            rw['max_24hr_entry'].insert(0, str(worker["max_24hr"]))
+        # Update worker_row_number to max +1 (max_row is still 0 when there are no workers, giving 1)
+        worker_row_number = max_row + 1
     if "selected_cannot_days" in data:
         selected_cannot_days.clear()
         selected_cannot_days.update({int(k): v for k, v in data["selected_cannot_days"].items()})
@@ -225,31 +270,28 @@ def load_preferences(widgets, state, callbacks):
     if "selected_manual_days" in data:
         selected_manual_days.clear()
         selected_manual_days.update({int(k): v for k, v in data["selected_manual_days"].items()})
-    # Set worker dicts from loaded selected dicts to ensure consistency
+    # Set worker dicts from loaded selected dicts to ensure consistency,
+    # and update that worker's button texts to show the selections in the same pass
     for worker in workers_list:
         row_num = worker["worker_row_number"]
-        worker["cannot_work"] = selected_cannot_days.get(row_num, [])
-        worker["prefers"] = selected_prefer_days.get(row_num, [])
-        worker["prefer_units"] = selected_units.get(row_num, [])
-        if row_num not in selected_manual_days:
-            selected_manual_days[row_num] = []
+        cannot_work  = selected_cannot_days.get(row_num, [])
+        prefers      = selected_prefer_days.get(row_num, [])
+        prefer_units = selected_units.get(row_num, [])
+        worker.update(cannot_work=cannot_work, prefers=prefers, prefer_units=prefer_units)
+        manual_days = selected_manual_days.setdefault(row_num, [])  # Gives the worker an empty manual list only if they have none yet
+        rw = worker_rows.get(row_num)
+        if rw is not None:
+            rw['cannot_button'].config(text=select_label(len(cannot_work)))
+            rw['prefer_button'].config(text=select_label(len(prefers)))
+            rw['prefer_unit_button'].config(text=select_label(len(prefer_units)))
+            rw['manual_button'].config(text=select_label(len(manual_days)))
     error_label.config(text="Preferences loaded.")
-    # Update button texts to show selections
-    for rw in worker_rows:
-        row_num = rw['row_num']
-        num_cannot = len(selected_cannot_days.get(row_num, []))
-        rw['cannot_button'].config(text=f"Select ({num_cannot})" if num_cannot > 0 else "Select")
-        num_prefer = len(selected_prefer_days.get(row_num, []))
-        rw['prefer_button'].config(text=f"Select ({num_prefer})" if num_prefer > 0 else "Select")
-        num_prefer_unit = len(selected_units.get(row_num, []))
-        rw['prefer_unit_button'].config(text=f"Select ({num_prefer_unit})" if num_prefer_unit > 0 else "Select")
-        num_manual = len(selected_manual_days.get(row_num, []))
-        rw['manual_button'].config(text=f"Select ({num_manual})" if num_manual > 0 else "Select")
-
-    print(f"Debugging. Year: {year}, month {month}, Holiday list: {holiday_days}, Shift list length {len(shifts_list)}")
-    for worker in workers_list:
-        print(worker)
-    print(selected_cannot_days)
+
+    if DEBUG_PRINTS:
+        # One joined print instead of one console write per worker
+        print("\n".join([f"Debugging. Year: {year}, month {month}, Holiday list: {holiday_days}, Shift list length {len(shifts_list)}",
+                         *map(str, workers_list),
+                         str(selected_cannot_days)]))
 
     # Return scalars so the wrapper in hospital_rota_app.py can update its globals
     return {"year": year, "month": month, "worker_row_number": worker_row_number}
@@ -273,7 +315,8 @@ def load_xlsx_preferences(widgets, state, callbacks):
 
         state (dict): Mutable objects modified in-place. Keys:
             - "workers_list"         : list of worker dictionaries
-            - "worker_rows"          : list of GUI row widget dicts
+            - "workers_by_row"       : dict {row_num: worker dict}, index into workers_list
+            - "worker_rows"          : dict {row_num: GUI row widget dict}
             - "selected_cannot_days" : dict {row_num: [shift strings]}
             - "selected_prefer_days" : dict {row_num: [shift strings]}
             - "selected_manual_days" : dict {row_num: [shift strings]}
@@ -298,6 +341,7 @@ def load_xlsx_preferences(widgets, state, callbacks):
 
     # Unpack mutable state (modified in-place)
     workers_list         = state["workers_list"]
+    workers_by_row       = state["workers_by_row"]
     worker_rows          = state["worker_rows"]
     selected_cannot_days = state["selected_cannot_days"]
     selected_prefer_days = state["selected_prefer_days"]
@@ -330,11 +374,15 @@ def load_xlsx_preferences(widgets, state, callbacks):
     # Local counter to track worker_row_number — kept in sync with the global
     # via set_worker_row_number() and add_worker_row()
     local_wrn = 1
+    wb = None  # So the finally block below knows whether there is a workbook to close
 
     try:
         # data_only=False → keep formulas and formatting (needed to read cell colors)
         # data_only=True would only give us the VALUES, losing all color information
-        wb = openpyxl.load_workbook(file_path, data_only=False)
+        # read_only=True → stream the rows straight from the file instead of building the whole workbook in memory.
+        # Read-only sheets are meant to be read top to bottom (iter_rows), not with sheet.cell(row, column),
+        # and they often don't know their own size (max_row / max_column can be None).
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=False)
         theme_colors = extract_theme_colors(file_path)
 
         # Try to find a suitable sheet
@@ -356,17 +404,32 @@ def load_xlsx_preferences(widgets, state, callbacks):
         if sheet is None:
             sheet = wb.active
 
-        # STEP: Read units from Row 1
-        # Scan every cell in Row 1 looking for one that starts with "Units_list=["
-        units_col_val  = None
+        # HEADER_ROW stays 1 — that's where day numbers and units always live. Row 2 holds the D / N labels.
+        HEADER_ROW = 1
+        SHIFT_TYPE_ROW = 2
+
+        # Read both header rows ONCE into plain lists (index 0 = column 1).
+        # All the header scans below use these instead of calling sheet.cell() again for every column.
+        header_values     = [cell.value for cell in sheet[HEADER_ROW]]
+        shift_type_values = [cell.value for cell in sheet[SHIFT_TYPE_ROW]]
+
+        # STEP: Read units and find the Shift_range column, both from Row 1
+        # One scan over Row 1 looks for the cell that starts with "Units_list=[" and the "Shift_range" cell
+        units_col_val   = None
         prefer_unit_col = None
+        shift_range_col = None
 
-        for col in range(1, sheet.max_column + 1):
-            cell_val = sheet.cell(row=1, column=col).value
-            if cell_val and str(cell_val).strip().startswith("Units_list=["):
-                units_col_val   = str(cell_val).strip()
+        for col, cell_val in enumerate(header_values, 1):
+            if not cell_val:
+                continue
+            text = str(cell_val).strip()
+            if units_col_val is None and text.startswith("Units_list=["):
+                units_col_val   = text
                 prefer_unit_col = col
-                break
+            elif shift_range_col is None and text.lower() == "shift_range":
+                shift_range_col = col
+            if units_col_val is not None and shift_range_col is not None:
+                break  # Found both, no need to look further
 
         if units_col_val is None:
             error_label.config(text="Error: Could not find 'Units_list=[...]' in Row 1. Please add it to the xlsx.")
@@ -375,7 +438,12 @@ def load_xlsx_preferences(widgets, state, callbacks):
         # Parse the list out of the string e.g. 'Units_list=["Cardiology", "Internal Medicine"]'
         bracket_start = units_col_val.index('[')
         bracket_part  = units_col_val[bracket_start:]
-        loaded_units  = ast.literal_eval(bracket_part)
+        # Double-quoted lists are plain JSON, which json.loads reads much faster than ast.literal_eval.
+        # Single-quoted lists like ['Cardiology'] aren't JSON, so those still go through literal_eval.
+        try:
+            loaded_units = json.loads(bracket_part)
+        except ValueError:
+            loaded_units = ast.literal_eval(bracket_part)
 
         # Update units_list in-place (clear + extend instead of reassigning)
         units_list.clear()
@@ -385,16 +453,12 @@ def load_xlsx_preferences(widgets, state, callbacks):
         current_units_label.config(text=f"Current Units: {', '.join(units_list)}")
         error_label.config(text=f"Units loaded: {', '.join(units_list)}")
 
-        # Find header row and the "Name" column
-        # HEADER_ROW stays 1 — that's where day numbers and units always live
-        HEADER_ROW = 1
-
-        # But "Name" might not be in Row 1 — scan column 1 to find it
+        # Find the "Name" column
+        # "Name" might not be in Row 1 — scan column 1 to find it
         name_col = 1
         NAME_ROW = None
 
-        for row in range(1, sheet.max_row + 1):
-            val = sheet.cell(row=row, column=1).value
+        for row, (val,) in enumerate(sheet.iter_rows(min_col=1, max_col=1, values_only=True), 1):
             if val and str(val).strip().lower() == "name":
                 NAME_ROW = row
                 break
@@ -406,24 +470,12 @@ def load_xlsx_preferences(widgets, state, callbacks):
         # Worker data always starts on the row immediately below "Name"
         FIRST_DATA_ROW = NAME_ROW + 1
 
-        # Find the Shift_range column by scanning Row 1
-        shift_range_col = None
-        for col in range(1, sheet.max_column + 1):
-            val = sheet.cell(row=1, column=col).value
-            if val and str(val).strip().lower() == "shift_range":
-                shift_range_col = col
-                break
-
         # Maps each column to its specific (day_number, shift_type) pair
         # by reading Row 1 (day numbers) AND Row 2 (D or N labels) together
         col_to_shift = {}
         current_day  = None
-        SHIFT_TYPE_ROW = 2
-
-        for col in range(1, sheet.max_column + 1):
-            day_val = sheet.cell(row=HEADER_ROW,    column=col).value
-            dn_val  = sheet.cell(row=SHIFT_TYPE_ROW, column=col).value
 
+        for col, (day_val, dn_val) in enumerate(zip(header_values, shift_type_values), 1):
             if day_val is not None:
                 try:
                     current_day = int(float(day_val))
@@ -451,13 +503,17 @@ def load_xlsx_preferences(widgets, state, callbacks):
             return None
 
         # Clear old data completely
-        for row_widgets in worker_rows[:]:  # [:] copies the list so we can safely clear it
+        for row_widgets in worker_rows.values():
             for key, widget in row_widgets.items():
-                if key != 'row_num' and widget.winfo_exists():
-                    widget.destroy()
+                if key not in ('row_num', 'range_var'):
+                    try:
+                        widget.destroy()
+                    except TclError:  # Already gone - nothing to clean up
+                        pass
 
         worker_rows.clear()
         workers_list.clear()
+        workers_by_row.clear()
         selected_cannot_days.clear()
         selected_prefer_days.clear()
         selected_manual_days.clear()
@@ -467,11 +523,13 @@ def load_xlsx_preferences(widgets, state, callbacks):
         local_wrn = 1
 
         loaded_count = 0
-        total_rows = sheet.max_row - FIRST_DATA_ROW + 1
 
         # Loop through each worker row
-        for row_idx, r in enumerate(range(FIRST_DATA_ROW, sheet.max_row + 1), 1):
-            name_val = sheet.cell(row=r, column=name_col).value
+        # iter_rows hands over each row as one tuple of cells, so a column is just row_cells[col - 1]
+        # instead of a sheet.cell(row, column) lookup for every cell
+        # max_col pads short rows with empty cells, so every column from the header rows can be looked up safely
+        for row_cells in sheet.iter_rows(min_row=FIRST_DATA_ROW, max_col=len(header_values)):
+            name_val = row_cells[name_col - 1].value
 
             if not name_val:
                 continue
@@ -486,10 +544,10 @@ def load_xlsx_preferences(widgets, state, callbacks):
             prefer_list = []
 
             for col, (day, shift_type) in col_to_shift.items():
-                cell = sheet.cell(row=r, column=col)
+                fill = row_cells[col - 1].fill  # Look the style up once per cell, not once per attribute
 
-                if cell.fill and cell.fill.fill_type == 'solid':
-                    color = cell.fill.start_color
+                if fill and fill.fill_type == 'solid':
+                    color = fill.start_color
                     color_hex = None
 
                     if isinstance(color.rgb, str):
@@ -502,16 +560,17 @@ def load_xlsx_preferences(widgets, state, callbacks):
                     if color_hex is None:
                         continue
 
-                    if is_red_color(color_hex):
+                    color_class = classify_color(color_hex)  # "red", "green" or None
+                    if color_class == "red":
                         cannot_list.append(f"{shift_type} {day}")
-                    elif is_green_color(color_hex):
+                    elif color_class == "green":
                         prefer_list.append(f"{shift_type} {day}")
 
             # Read preferred units for this worker
             prefer_units = []
 
             if prefer_unit_col is not None:
-                raw = sheet.cell(row=r, column=prefer_unit_col).value
+                raw = row_cells[prefer_unit_col - 1].value
 
                 if raw is not None:
                     if isinstance(raw, float):
@@ -532,7 +591,7 @@ def load_xlsx_preferences(widgets, state, callbacks):
             max_shifts = 4
 
             if shift_range_col is not None:
-                raw = sheet.cell(row=r, column=shift_range_col).value
+                raw = row_cells[shift_range_col - 1].value
 
                 if raw is not None:
                     if isinstance(raw, float):
@@ -559,6 +618,7 @@ def load_xlsx_preferences(widgets, state, callbacks):
                 "worker_row_number": local_wrn
             }
             workers_list.append(worker_dict)
+            workers_by_row[local_wrn] = worker_dict
 
             current_row_num = local_wrn
 
@@ -566,31 +626,22 @@ def load_xlsx_preferences(widgets, state, callbacks):
             local_wrn += 1    # keep local counter in sync
 
             # Fill in the values in the GUI
-            for row_widgets in worker_rows:
-                if row_widgets['row_num'] == current_row_num:
-                    row_widgets['name_entry'].delete(0, END)
-                    row_widgets['name_entry'].insert(0, name)
-
-                    row_widgets['range_entry'].delete(0, END)
-                    row_widgets['range_entry'].insert(0, f"{min_shifts}-{max_shifts}")
-
-                    row_widgets['max_weekends_entry'].delete(0, END)
-                    row_widgets['max_weekends_entry'].insert(0, "100")
-
-                    row_widgets['max_24hr_entry'].delete(0, END)
-                    row_widgets['max_24hr_entry'].insert(0, "100")
-
-                    row_widgets['cannot_button'].config(
-                        text=f"Select ({len(cannot_list)})" if cannot_list else "Select"
-                    )
-                    row_widgets['prefer_button'].config(
-                        text=f"Select ({len(prefer_list)})" if prefer_list else "Select"
-                    )
-                    row_widgets['prefer_unit_button'].config(
-                        text=f"Select ({len(prefer_units)})" if prefer_units else "Select"
-                    )
-                    row_widgets['manual_button'].config(text="Select")
-                    break
+            row_widgets = worker_rows[current_row_num]
+            row_widgets['name_entry'].delete(0, END)
+            row_widgets['name_entry'].insert(0, name)
+
+            row_widgets['range_var'].set(f"{min_shifts}-{max_shifts}")
+
+            row_widgets['max_weekends_entry'].delete(0, END)
+            row_widgets['max_weekends_entry'].insert(0, "100")
+
+            row_widgets['max_24hr_entry'].delete(0, END)
+            row_widgets['max_24hr_entry'].insert(0, "100")
+
+            row_widgets['cannot_button'].config(text=select_label(len(cannot_list)))
+            row_widgets['prefer_button'].config(text=select_label(len(prefer_list)))
+            row_widgets['prefer_unit_button'].config(text=select_label(len(prefer_units)))
+            row_widgets['manual_button'].config(text=select_label(0))
 
             # Store selections for the popup windows
             selected_cannot_days[current_row_num] = cannot_list
@@ -600,62 +651,49 @@ def load_xlsx_preferences(widgets, state, callbacks):
 
             loaded_count += 1
 
-            # Show progress every 5 workers (helps with large files)
-            if loaded_count % 5 == 0 or row_idx == total_rows:
-                error_label.config(text=f"Loading... {loaded_count} worker(s)")
-                root.update()  # Force GUI to refresh
-
         # Final success message
         error_label.config(text=f"✓ Loaded {loaded_count} worker(s) — red = cannot, green = prefer")
+        # Lay out all the new rows in one go, instead of forcing a full GUI refresh every 5 workers
+        root.update_idletasks()
 
     except Exception as e:
         error_label.config(text=f"Error reading file: {str(e)}")
         print("Detailed error:", e)
         return None
 
+    finally:
+        # A read-only workbook keeps the file open until it is closed
+        if wb is not None:
+            wb.close()
+
     return {"worker_row_number": local_wrn}
 
-# Helper functions for color detection
-def is_red_color(color_hex):
+# Helper function for color detection
+# A sheet only uses a handful of different colors, so remember the answer for each hex code
+# instead of converting the same hex string again for every colored cell.
+@lru_cache(maxsize=256)
+def classify_color(color_hex):
     """
-    Check if a color hex code (RRGGBB) represents red.
-    Returns True for pure red and close variations.
+    Check if a color hex code (RRGGBB) represents red or green.
+    Returns "red" / "green" for pure colors and close variations, None for anything else.
     
     Args:
         color_hex: 6-character hex string like "FF0000"
     
     Returns:
-        bool: True if the color is red-ish
+        str or None: "red" if the color is red-ish, "green" if green-ish, otherwise None
     """
     try:
-        r = int(color_hex[0:2], 16)
-        g = int(color_hex[2:4], 16)
-        b = int(color_hex[4:6], 16)
-        # Red if: red channel is the biggest AND clearly dominates green and blue
-        return r > g and r > b and r > 100
-    except (ValueError, IndexError):
-        return False
-
-
-def is_green_color(color_hex):
-    """
-    Check if a color hex code (RRGGBB) represents green.
-    Returns True for pure green and close variations.
-    
-    Args:
-        color_hex: 6-character hex string like "00FF00"
-    
-    Returns:
-        bool: True if the color is green-ish
-    """
-    try:
-        r = int(color_hex[0:2], 16)
-        g = int(color_hex[2:4], 16)
-        b = int(color_hex[4:6], 16)
-        # Green if: green channel is the biggest AND clearly dominates red and blue
-        return g > r and g > b and g > 100
-    except (ValueError, IndexError):
-        return False
+        r, g, b = bytes.fromhex(color_hex)  # "FF8000" → 255, 128, 0 in one go
+    except ValueError:  # Not hex, or not exactly 3 bytes long
+        return None
+    # Red if: red channel is the biggest AND clearly dominates green and blue
+    if r > g and r > b and r > 100:
+        return "red"
+    # Green if: green channel is the biggest AND clearly dominates red and blue
+    if g > r and g > b and g > 100:
+        return "green"
+    return None
 
 def extract_theme_colors(file_path):
     """
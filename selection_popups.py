@@ -1,5 +1,6 @@
 
 from tkinter import *
+from date_settings import DAY_NAMES  # Shared weekday names, so each popup doesn't build its own list
 
 def prefer_count(prefer_popup_inputs):
     
@@ -40,7 +41,6 @@ def prefer_count(prefer_popup_inputs):
     Label(scrollable_frame, text="Day Shift").grid(row=0, column=2)
     Label(scrollable_frame, text="Night Shift").grid(row=0, column=3)
 
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     check_vars = []
 
     # Create separate lists to hold ONLY day shift variables and ONLY night shift variables
@@ -49,7 +49,7 @@ def prefer_count(prefer_popup_inputs):
 
     for i, day in enumerate(days_list, start=1):
         weekday = (starting_weekday + (day - 1)) % 7
-        day_name = day_names[weekday]
+        day_name = DAY_NAMES[weekday]
         Label(scrollable_frame, text=str(day)).grid(row=i, column=0)
         Label(scrollable_frame, text=day_name).grid(row=i, column=1)
         
@@ -66,7 +66,7 @@ def prefer_count(prefer_popup_inputs):
         night_shift_vars.append(night_var)  # Add to night shift list
     
     # Pre-select
-    existing_selections = selected_prefer_days.get(row_num, [])
+    existing_selections = set(selected_prefer_days.get(row_num, []))  # Set: each "is it ticked?" check is one lookup
     for shift_name, var in check_vars:
         if shift_name in existing_selections:
             var.set(1)
@@ -110,13 +110,12 @@ def prefer_count(prefer_popup_inputs):
         # Update the dict (mutates the original dict in main.py)
         selected_prefer_days[row_num] = selected_shifts
         # Update button text
-        for row_widgets in worker_rows:
-            if row_widgets['row_num'] == row_num:
-                num = len(selected_shifts)
-                row_widgets['prefer_button'].config(
-                    text=f"Select ({num})" if num > 0 else "Select"
-                )
-                break
+        row_widgets = worker_rows.get(row_num)  # None if the row was deleted while the popup was open
+        if row_widgets:
+            num = len(selected_shifts)
+            row_widgets['prefer_button'].config(
+                text=f"Select ({num})" if num > 0 else "Select"
+            )
         # Show message (exactly like the other popups)
         if selected_shifts:
             error_label.config(
@@ -168,7 +167,6 @@ def cannot_count(cannot_popup_inputs):
     Label(scrollable_frame, text="Day Shift").grid(row=0, column=2)
     Label(scrollable_frame, text="Night Shift").grid(row=0, column=3)
     
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     check_vars = []
     
     # Create separate lists to hold ONLY day shift variables and ONLY night shift variables
@@ -177,7 +175,7 @@ def cannot_count(cannot_popup_inputs):
     
     for i, day in enumerate(days_list, start=1):
         weekday = (starting_weekday + (day - 1)) % 7
-        day_name = day_names[weekday]
+        day_name = DAY_NAMES[weekday]
         Label(scrollable_frame, text=str(day)).grid(row=i, column=0)
         Label(scrollable_frame, text=day_name).grid(row=i, column=1)
         
@@ -194,7 +192,7 @@ def cannot_count(cannot_popup_inputs):
         night_shift_vars.append(night_var)  # Add to night shift list
 
     # Pre-select checkboxes based on existing selections for this row_num
-    existing_selections = selected_cannot_days.get(row_num, [])
+    existing_selections = set(selected_cannot_days.get(row_num, []))  # Set: each "is it ticked?" check is one lookup
     for shift_name, var in check_vars:
         if shift_name in existing_selections:
             var.set(1)
@@ -238,11 +236,10 @@ def cannot_count(cannot_popup_inputs):
         selected_cannot_days[row_num] = selected_shifts
         
         # Update button text
-        for row_widgets in worker_rows:
-            if row_widgets['row_num'] == row_num:
-                num = len(selected_shifts)
-                row_widgets['cannot_button'].config(text=f"Select ({num})" if num > 0 else "Select")
-                break
+        row_widgets = worker_rows.get(row_num)  # None if the row was deleted while the popup was open
+        if row_widgets:
+            num = len(selected_shifts)
+            row_widgets['cannot_button'].config(text=f"Select ({num})" if num > 0 else "Select")
         if selected_shifts:
             error_label.config(text=f"Worker cannot work on these shifts: {', '.join(selected_shifts)}")
         else:
@@ -301,7 +298,7 @@ def prefer_unit_count(prefer_unit_popup_inputs):
         unit_vars.append((f"{unit}", unit_var))
 
     # Pre-select checkboxes based on existing selections for this row_num
-    existing_selections = selected_units.get(row_num, [])
+    existing_selections = set(selected_units.get(row_num, []))  # Set: each "is it ticked?" check is one lookup
     for unit, var in unit_vars: # Go through all units vars
         if unit in existing_selections: # If "Internal Medicine" is in existing_selections, var.set(1) for "Internal Medicine"
             var.set(1)
@@ -312,11 +309,10 @@ def prefer_unit_count(prefer_unit_popup_inputs):
         selected_units_list = [unit for unit, var in unit_vars if var.get() == 1] # Gives ["Cardiology", "Oncology"]
         selected_units[row_num] = selected_units_list
         # Update button text
-        for row_widgets in worker_rows:
-            if row_widgets['row_num'] == row_num:
-                num = len(selected_units_list)
-                row_widgets['prefer_unit_button'].config(text=f"Select ({num})" if num > 0 else "Select")
-                break
+        row_widgets = worker_rows.get(row_num)  # None if the row was deleted while the popup was open
+        if row_widgets:
+            num = len(selected_units_list)
+            row_widgets['prefer_unit_button'].config(text=f"Select ({num})" if num > 0 else "Select")
         if selected_units_list:
             error_label.config(text=f"Worker prefers these units: {', '.join(selected_units_list)}")
         else:
@@ -365,7 +361,6 @@ def manual_count(manual_popup_inputs):
     Label(scrollable_frame, text="Day Shift").grid(row=0, column=2)
     Label(scrollable_frame, text="Night Shift").grid(row=0, column=3)
 
-    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     check_vars = []
 
     # Create separate lists to hold ONLY day shift variables and ONLY night shift variables
@@ -374,7 +369,7 @@ def manual_count(manual_popup_inputs):
 
     for i, day in enumerate(days_list, start=1):
         weekday = (starting_weekday + (day - 1)) % 7
-        day_name = day_names[weekday]
+        day_name = DAY_NAMES[weekday]
         Label(scrollable_frame, text=str(day)).grid(row=i, column=0)
         Label(scrollable_frame, text=day_name).grid(row=i, column=1)
         
@@ -391,7 +386,7 @@ def manual_count(manual_popup_inputs):
         night_shift_vars.append(night_var)  # Add to night shift list
 
     # Pre-select checkboxes based on existing selections for this row_num
-    existing_selections = selected_manual_days.get(row_num, [])
+    existing_selections = set(selected_manual_days.get(row_num, []))  # Set: each "is it ticked?" check is one lookup
     unit_var = StringVar(value=units_list[0] if units_list else "")  # Default to first unit or empty
     for unit in units_list: # Go through all units to find the shifts like "Day 5 Cardiology"
         for shift_name, var in check_vars: # Go through shift_name(s) in check_vars like "Day 5"
@@ -447,11 +442,10 @@ def manual_count(manual_popup_inputs):
 
         selected_manual_days[row_num] = selected_shifts
         # Update button text
-        for row_widgets in worker_rows:
-            if row_widgets['row_num'] == row_num:
-                num = len(selected_shifts)
-                row_widgets['manual_button'].config(text=f"Select ({num})" if num > 0 else "Select")
-                break
+        row_widgets = worker_rows.get(row_num)  # None if the row was deleted while the popup was open
+        if row_widgets:
+            num = len(selected_shifts)
+            row_widgets['manual_button'].config(text=f"Select ({num})" if num > 0 else "Select")
         if selected_shifts:
             error_label.config(text=f"Worker manually assigned to these shifts: {', '.join(selected_shifts)}")
         else:
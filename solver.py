@@ -9,6 +9,9 @@ import pulp
 import sys
 import os
 import subprocess
+import json
+import hashlib
+from collections import OrderedDict, defaultdict
 
 # Hide CBC console window when running as a packaged .exe
 if hasattr(sys, '_MEIPASS') and sys.platform == 'win32':
@@ -18,9 +21,11 @@ if hasattr(sys, '_MEIPASS') and sys.platform == 'win32':
         _original_popen_init(self, *args, **kwargs)
     subprocess.Popen.__init__ = _hidden_popen_init
 
-def solve_rota(shifts_list, workers_list, units_list, settings):
+def _solve_rota_uncached(shifts_list, workers_list, units_list, settings):
     """
-    Multi-unit rota solver.
+    Multi-unit rota solver. Called through solve_rota() below, which remembers recent results.
+    Returns (assignments, summary, solution_status) - solution_status is PuLP's prob.sol_status
+    (None if there was nothing to solve), which solve_rota() uses to decide what is worth keeping.
     
     Handles shifts across multiple units with rules:
     - Only one shift per worker per day (except 24hr = Day+Night SAME unit)
@@ -53,11 +58,12 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     # STEP 3: Find empty shifts
     # ============================================================================
     empty_shifts = [name for name in assignments if assignments[name] is None]
+    empty_shifts_set = frozenset(empty_shifts)  # Same shifts, for quick "is it empty?" checks
     
     # Find empty weekend shifts
     empty_weekend_shifts = []
     for shift in shifts_list:
-        if shift["name"] in empty_shifts and "Weekend" in shift["tags"]:
+        if shift["name"] in empty_shifts_set and "Weekend" in shift["tags"]:
             empty_weekend_shifts.append(shift["name"])
     
     # ============================================================================
@@ -76,28 +82,35 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
         - "Day 5 Cardiology" → ("Day", 5, "Cardiology")
         - "Night 12 Internal Medicine" → ("Night", 12, "Internal Medicine")
         """
-        parts = shift_name.split()
-        shift_type = parts[0]  # "Day" or "Night"
-        day = int(parts[1])    # Day number
-        unit = " ".join(parts[2:])  # Unit name (may contain spaces)
-        return shift_type, day, unit
+        # maxsplit=2: cut only at the first two spaces, so the unit (which may contain spaces)
+        # comes out whole - no need to split it into words and join them back
+        shift_type, day, unit = shift_name.split(" ", 2)  # "Day" or "Night", day number, unit name
+        return shift_type, int(day), unit
     
     # ============================================================================
     # STEP 6: Build bad pairs with multi-unit logic
     # ============================================================================
     
-    bad_night_to_day_pairs = []       # Night (any unit) day X → Day (any unit) day X+1
-    bad_adjacent_nights_pairs = []    # Night (any unit) day X → Night (any unit) day X+1
-    bad_adjacent_days_pairs = []      # Day (any unit) day X → Day (any unit) day X+1
-    twenty_four_hour_shift_pairs = [] # Day X unit A + Night X unit A (SAME unit only)
-    bad_same_day_non24hr_pairs = []   # Any two shifts on same day that are NOT (Day+Night same unit)
+    shifts_by_day_type = defaultdict(list)        # {(day, "Day"/"Night"): [shift names]}, for CONSTRAINTS 3-5
+    twenty_four_hour_shift_pairs = []             # Day X unit A + Night X unit A (SAME unit only)
+    twenty_four_pairs_by_day = defaultdict(list)  # {day: [24hr pairs on that day]}, for CONSTRAINT 6
     
+    # Parse every shift name ONCE: {shift_name: (shift_type, day, unit)}
+    # Everything below looks the parts up here instead of splitting the name again.
+    shift_parts = {}
+
     # Group shifts by day for easier processing
-    shifts_by_day = {}
-    for shift_name in empty_shifts:
-        shift_type, day, unit = parse_shift_name(shift_name)
-        if day not in shifts_by_day:
-            shifts_by_day[day] = []
+    # (defaultdict: a new day starts as an empty list, no "if day not in ..." check needed)
+    shifts_by_day = defaultdict(list)
+    for shift in shifts_list:
+        shift_name = shift["name"]
+        if "day" in shift:  # make_shifts stores the parts, so no need to split the name
+            shift_type, day, unit = shift["type"], shift["day"], shift["unit"]
+        else:  # Shifts loaded from older save files only have the name
+            shift_type, day, unit = parse_shift_name(shift_name)
+        shift_parts[shift_name] = (shift_type, day, unit)
+        if shift["assigned_worker"] is not None:  # Same shifts as empty_shifts, same order
+            continue
         shifts_by_day[day].append((shift_name, shift_type, unit))
     
     """
@@ -115,28 +128,19 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     """
 
     # ========================================================================
-    # Process consecutive days for Night→Day, Night→Night, Day→Day
+    # Group shifts by day and type for Night→Day, Night→Night, Day→Day
     # ========================================================================
-    for day in sorted(shifts_by_day.keys()):
-        if day + 1 in shifts_by_day:
-            # Compare all shifts on day X with all shifts on day X+1
-            for shift1_name, type1, unit1 in shifts_by_day[day]:
-                for shift2_name, type2, unit2 in shifts_by_day[day + 1]:
-                    # Rule: Night → Day (any units) is forbidden
-                    if type1 == "Night" and type2 == "Day":
-                        bad_night_to_day_pairs.append((shift1_name, shift2_name))
-                    
-                    # Rule: Night → Night (any units) is forbidden
-                    if type1 == "Night" and type2 == "Night":
-                        bad_adjacent_nights_pairs.append((shift1_name, shift2_name))
-                    
-                    # Rule: Day → Day (any units) is forbidden (if enabled)
-                    if type1 == "Day" and type2 == "Day":
-                        bad_adjacent_days_pairs.append((shift1_name, shift2_name))
+    # No pairs needed here: CONSTRAINTS 3-5 take whole groups, e.g. "the Nights of day X
+    # and the Days of day X+1" (any units), and allow at most one shift out of the lot.
+    for day, shifts_on_day in shifts_by_day.items():
+        for shift_name, shift_type, unit in shifts_on_day:
+            shifts_by_day_type[(day, shift_type)].append(shift_name)
     
     # ========================================================================
     # Process same-day shifts
     # ========================================================================
+    # Only the 24hr pairs are collected: every other same-day pair is forbidden, and
+    # CONSTRAINT 6 rules those out with one row per worker per day instead of one per pair.
     for day, shifts_on_day in shifts_by_day.items():
         # Compare all pairs of shifts on the same day
         for i, (shift1_name, type1, unit1) in enumerate(shifts_on_day):
@@ -148,34 +152,27 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
                 if is_same_unit and is_day_and_night:
                     # This is an ALLOWED 24hr shift
                     twenty_four_hour_shift_pairs.append((shift1_name, shift2_name))
-                else:
-                    # This is FORBIDDEN (different units or both same type)
-                    # Examples: 
-                    # - "Day 5 Cardiology" + "Day 5 Internal Medicine" (different units)
-                    # - "Day 5 Cardiology" + "Night 5 Internal Medicine" (different units)
-                    # - "Day 5 Cardiology" + "Day 5 Cardiology" (same type, impossible but handle it)
-                    bad_same_day_non24hr_pairs.append((shift1_name, shift2_name))
+                    twenty_four_pairs_by_day[day].append((shift1_name, shift2_name))
     
     # ========================================================================
     # Build spacing pairs (shifts too close together)
     # ========================================================================
 
     # Only use empty shifts - no point tracking spacing for already-assigned shifts
-    # Sort them by day number so we can use the early-exit trick below
-    empty_shifts_sorted = sorted(
-        empty_shifts,
-        key=lambda s: parse_shift_name(s)[1]  # Sort by day number
-    )
+    # Sort them by day number so we can use the early-exit trick below.
+    # shifts_by_day already has them grouped by day (in empty_shifts order within a day),
+    # so walking the days in order gives the sorted list, with each day number ready to use.
+    empty_shifts_sorted = [(day, shift_name)
+                           for day in sorted(shifts_by_day)
+                           for shift_name, _, _ in shifts_by_day[day]]
 
     bad_spacing_pairs = []
 
     for i in range(len(empty_shifts_sorted)):
-        shift1 = empty_shifts_sorted[i]
-        _, day1, _ = parse_shift_name(shift1)
+        day1, shift1 = empty_shifts_sorted[i]
 
         for j in range(i + 1, len(empty_shifts_sorted)):
-            shift2 = empty_shifts_sorted[j]
-            _, day2, _ = parse_shift_name(shift2)
+            day2, shift2 = empty_shifts_sorted[j]
 
             # KEY CHANGE: since the list is sorted by day, once the gap is
             # big enough, ALL remaining shifts will also be too far away.
@@ -197,12 +194,17 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     # Convert from {row_num: ["Cardiology"]} to {"Dr. Smith": ["Cardiology"]}
     worker_preferred_units = {}
     for w in workers_list:
-        worker_preferred_units[w["name"]] = w.get("prefer_units", [])
+        worker_preferred_units[w["name"]] = frozenset(w.get("prefer_units", []))
     
+    shifts_to_fill = {w["name"]: w["shifts_to_fill"] for w in workers_list}  # [min, max] per worker
     max_24hr = {w["name"]: w["max_24hr"] for w in workers_list}
     max_weekends = {w["name"]: w["max_weekends"] for w in workers_list}
 
+    # The preferred and cannot lists are stored as sets: the objective, the summary and STEP 10
+    # only ever ask "is this shift in there?", which a set answers without scanning the whole list.
+    # Both are built in the same pass over the workers.
     worker_prefers = {}
+    worker_cannot_set = {}
     for w in workers_list:
         name = w["name"]
         old_prefers = w["prefers"]   # e.g. ["Day 5", "Night 12"]
@@ -212,20 +214,14 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
                 # old_shift is like "Day 5" or "Night 3"
                 new_shift = f"{old_shift} {unit}"
                 new_prefers.append(new_shift)
-        worker_prefers[name] = new_prefers # new shift is "Day 5 Cardiology", "Day 5 Internal Medicine"
+        worker_prefers[name] = frozenset(new_prefers) # new shift is "Day 5 Cardiology", "Day 5 Internal Medicine"
 
-    # Now transform the cannot lists
-    worker_cannot = {}
-    for w in workers_list:
-        name = w["name"]
+        # Now transform the cannot list, straight into a set.
+        # Not frozen: STEP 10 adds the shifts that clash with manually assigned ones to it.
         old_forbidden = w["cannot_work"]   # e.g. ["Day 5", "Night 12"]
-        new_forbidden = []       
-        for unit in units_list:
-            for old_shift in old_forbidden:
-                # old_shift is like "Day 5" or "Night 3"
-                new_shift = f"{old_shift} {unit}"
-                new_forbidden.append(new_shift)
-        worker_cannot[name] = new_forbidden
+        worker_cannot_set[name] = {f"{old_shift} {unit}"   # old_shift is like "Day 5" or "Night 3"
+                                   for unit in units_list
+                                   for old_shift in old_forbidden}
 
     # ============================================================================
     # STEP 8: Check if there's anything to solve
@@ -237,7 +233,7 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
             "twenty_four_count": 0,
             "bad_spacing_count": 0,
             "status": "Nothing to assign"
-        }
+        }, None  # No solve happened
     
     # ============================================================================
     # STEP 9: Create the optimization problem
@@ -252,12 +248,75 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     # creating variables. This is like crossing names off a list before the
     # solver even starts thinking.
 
-    # We use a set for worker_cannot lookups because checking "x in a set" is
+    # We use a set for worker_cannot lookups (built in STEP 7) because checking "x in a set" is
     # much faster than "x in a list" - a set works like an index, a list has to
     # check every single item one by one.
-    worker_cannot_set = {}
+
+    # Manually assigned shifts and constraints.
+    # Respect adjacency rules between manually assigned shifts and empty shifts.
+    # Respect Max 24hr preferences between manually assigned shifts and empty shifts.
+    #
+    # The solver only knows about empty shifts - it can't see manually assigned
+    # ones when building pairs. So for each worker, we look at what they're already
+    # assigned, and cross off any empty shift that would break a rule with those
+    # assignments - exactly like a "cannot work" shift.
+
+    # First build a lookup: {worker_name: {day: [(shift_type, unit), ...]}} of their pre-assigned shifts.
+    # Every rule below only involves the day before, the same day or the day after, so each
+    # empty shift just looks up those three days instead of going through all manual shifts.
+    pre_assigned_by_day = {w: defaultdict(list) for w in workers}
+    for shift in shifts_list:
+        if shift["assigned_worker"] in pre_assigned_by_day:
+            pre_type, pre_day, pre_unit = shift_parts[shift["name"]]
+            pre_assigned_by_day[shift["assigned_worker"]][pre_day].append((pre_type, pre_unit))
+
     for w in workers:
-        worker_cannot_set[w] = set(worker_cannot[w])  # Convert list → set for speed
+        pre_by_day = pre_assigned_by_day[w]
+        if not pre_by_day:
+            continue  # Nothing assigned by hand - nothing to cross off
+
+        for emp_day, shifts_on_day in shifts_by_day.items():
+            day_before = pre_by_day.get(emp_day - 1, [])
+            same_day = pre_by_day.get(emp_day, [])
+            day_after = pre_by_day.get(emp_day + 1, [])
+            if not (day_before or same_day or day_after):
+                continue
+
+            for empty_shift, emp_type, emp_unit in shifts_on_day:
+                for pre_type, _ in day_before:
+                    # Night → Day: pre-assigned Night X, empty Day X+1
+                    if pre_type == "Night" and emp_type == "Day":
+                        worker_cannot_set[w].add(empty_shift)
+
+                    # Night → Night: pre-assigned Night X, empty Night X+1
+                    if enforce_no_adj_nights and pre_type == "Night" and emp_type == "Night":
+                        worker_cannot_set[w].add(empty_shift)
+
+                    # Day → Day: pre-assigned Day X, empty Day X+1
+                    if enforce_no_adj_days and pre_type == "Day" and emp_type == "Day":
+                        worker_cannot_set[w].add(empty_shift)
+
+                for pre_type, _ in day_after:
+                    # Day → Night (reverse): pre-assigned Day X+1, empty Night X
+                    # This handles the case where manual shift is AFTER the empty shift
+                    if emp_type == "Night" and pre_type == "Day":
+                        worker_cannot_set[w].add(empty_shift)
+
+                    # Night → Night (reverse): pre-assigned Night X+1, empty Night X
+                    if enforce_no_adj_nights and pre_type == "Night" and emp_type == "Night":
+                        worker_cannot_set[w].add(empty_shift)
+
+                    # Day → Day (reverse): pre-assigned Day X+1, empty Day X
+                    if enforce_no_adj_days and pre_type == "Day" and emp_type == "Day":
+                        worker_cannot_set[w].add(empty_shift)
+
+                # 24hr block: if worker has max_24hr = 0 and a manually assigned
+                # shift on the same day and same unit, block the other half.
+                # Same day + same unit + different type = would form a 24hr shift.
+                if max_24hr[w] == 0:
+                    for pre_type, pre_unit in same_day:
+                        if emp_unit == pre_unit and {emp_type, pre_type} == {"Day", "Night"}:
+                            worker_cannot_set[w].add(empty_shift)
 
     # Now build assign_vars manually instead of using pulp.LpVariable.dicts()
     # assign_vars[worker][shift] will be either:
@@ -295,91 +354,156 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     print(f"Variables created: {variables_created} | Variables pruned (skipped): {variables_skipped}")
     print(f"Reduction: {round(variables_skipped / (variables_created + variables_skipped) * 100)}% fewer variables")
 
-    # twenty_four_vars and spacing_var stay the same - they're already small
-    twenty_four_vars = pulp.LpVariable.dicts("24hr", 
-                                            (workers, twenty_four_hour_shift_pairs), 
-                                            0, 1, 
-                                            pulp.LpBinary)
+    # twenty_four_vars and spacing_var follow the same idea, one per (worker, pair of shifts):
+    #   - A real PuLP variable (if the worker could have BOTH shifts of the pair)
+    #   - The number 0             (if either shift is pruned for them - the pair can never happen)
+    twenty_four_vars = {}
+    spacing_var = {}
+    for w in workers:
+        twenty_four_vars[w] = {}
+        for pair in twenty_four_hour_shift_pairs:
+            if (isinstance(assign_vars[w][pair[0]], pulp.LpVariable)
+                    and isinstance(assign_vars[w][pair[1]], pulp.LpVariable)):
+                twenty_four_vars[w][pair] = pulp.LpVariable(f"24hr_{w}_{pair}", 0, 1, pulp.LpBinary)
+            else:
+                twenty_four_vars[w][pair] = 0
+
+        spacing_var[w] = {}
+        for pair in bad_spacing_pairs:
+            if (isinstance(assign_vars[w][pair[0]], pulp.LpVariable)
+                    and isinstance(assign_vars[w][pair[1]], pulp.LpVariable)):
+                spacing_var[w][pair] = pulp.LpVariable(f"SpacingBad_{w}_{pair}", 0, 1, pulp.LpBinary)
+            else:
+                spacing_var[w][pair] = 0
+    
+    # Helper: the sum of some variables, skipping the pruned 0s.
+    # Handing PuLP a list of (variable, coefficient) pairs builds the expression in one go,
+    # instead of lpSum adding the terms one at a time.
+    def sum_of(variables):
+        return pulp.LpAffineExpression([(var, 1) for var in variables if isinstance(var, pulp.LpVariable)])
+
+    # Helper: "at most one of these can be 1". The left side is built as one expression and compared
+    # to the plain number 1, which is PuLP's quickest way to make a constraint.
+    # If fewer than two are real variables (the rest are pruned 0s), the rule can never be broken.
+    def add_at_most_one(variables):
+        group = sum_of(variables)
+        if len(group) >= 2:
+            prob.addConstraint(group <= 1)
+
+    # Helper: make link_var = 1 exactly when var1 AND var2 are both 1 (used for 24hr and spacing).
+    # Each side is written out as a (variable, coefficient) list with a plain number on the right,
+    # so PuLP doesn't have to build and subtract temporary expressions.
+    #
+    # Only the rows that can actually matter are added:
+    #   force_up   - the "both assigned -> 1" row. Needed when something would rather keep the
+    #                link var at 0 (negative points, or a "max per worker" limit on it).
+    #   force_down - the two "one is 0 → 0" rows. Needed only when something would rather push
+    #                the link var up to 1 (positive points, or the allowance in CONSTRAINT 6).
+    #                Otherwise the solver never raises it without being forced.
+    def add_both_link(link_var, var1, var2, force_up, force_down):
+        if force_up:
+            # If both are assigned, link var becomes 1:   link - var1 - var2 >= -1
+            prob.addConstraint(pulp.LpAffineExpression([(link_var, 1), (var1, -1), (var2, -1)]) >= -1)
+        if force_down:
+            # If var1 is 0, link var must be 0:          link - var1 <= 0
+            prob.addConstraint(pulp.LpAffineExpression([(link_var, 1), (var1, -1)]) <= 0)
+            # If var2 is 0, link var must be 0:          link - var2 <= 0
+            prob.addConstraint(pulp.LpAffineExpression([(link_var, 1), (var2, -1)]) <= 0)
 
-    spacing_var = pulp.LpVariable.dicts("SpacingBad", 
-                                    (workers, bad_spacing_pairs), 
-                                    0, 1, 
-                                    pulp.LpBinary)
-    
     # ============================================================================
     # STEP 11: Define the objective function
     # ============================================================================
-    prob += (
-        points_filled * pulp.lpSum(assign_vars[w][shift] 
-                                   for w in workers 
-                                   for shift in empty_shifts)
-        + points_preferred * pulp.lpSum(assign_vars[w][shift] 
-                                       for w in workers 
-                                       for shift in empty_shifts 
-                                       if shift in worker_prefers[w])
-        + points_preferred_unit * pulp.lpSum(assign_vars[w][shift]
-                                        for w in workers
-                                        for shift in empty_shifts
-                                        if parse_shift_name(shift)[2] in worker_preferred_units[w])
-        + points_spacing * pulp.lpSum(spacing_var[w][pair] 
-                                     for w in workers 
-                                     for pair in bad_spacing_pairs)
-        + points_24hr * pulp.lpSum(twenty_four_vars[w][pair] 
-                                  for w in workers 
-                                  for pair in twenty_four_hour_shift_pairs)
-    )
+    # Each assignment variable gets ONE coefficient with all its points added up:
+    # points for filling the shift, + preferred shift points, + preferred unit points.
+    objective_terms = []
+    for w in workers:
+        for shift in empty_shifts:
+            var = assign_vars[w][shift]
+            if not isinstance(var, pulp.LpVariable):
+                continue  # Pruned pairing, always 0
+            points = points_filled
+            if shift in worker_prefers[w]:
+                points += points_preferred
+            if shift_parts[shift][2] in worker_preferred_units[w]:
+                points += points_preferred_unit
+            objective_terms.append((var, points))
+    objective_terms.extend((spacing_var[w][pair], points_spacing)
+                           for w in workers
+                           for pair in bad_spacing_pairs
+                           if isinstance(spacing_var[w][pair], pulp.LpVariable))
+    objective_terms.extend((twenty_four_vars[w][pair], points_24hr)
+                           for w in workers
+                           for pair in twenty_four_hour_shift_pairs
+                           if isinstance(twenty_four_vars[w][pair], pulp.LpVariable))
+    prob += pulp.LpAffineExpression(objective_terms)
     
     # ============================================================================
     # STEP 12: Add constraints
     # ============================================================================
     
+    # All rows go straight to prob.addConstraint (like the helpers above) rather than through
+    # "prob += ...", which first has to work out whether it was handed a constraint or an objective.
+    # PuLP then numbers them _C1, _C2, ... on its own, which already keeps the MPS file compact.
+
     # CONSTRAINT 1: Each shift has at most 1 worker
     for shift in empty_shifts:
-        prob += pulp.lpSum(assign_vars[w][shift] for w in workers) <= 1
+        prob.addConstraint(sum_of(assign_vars[w][shift] for w in workers) <= 1)
     
     # CONSTRAINT 2: Worker must work within their shift range
     for w in workers:
-        min_shifts, max_shifts = next(worker["shifts_to_fill"] 
-                                     for worker in workers_list 
-                                     if worker["name"] == w)
-        prob += pulp.lpSum(assign_vars[w][shift] for shift in empty_shifts) <= max_shifts
-        prob += pulp.lpSum(assign_vars[w][shift] for shift in empty_shifts) >= min_shifts
-    
+        min_shifts, max_shifts = shifts_to_fill[w]
+        prob.addConstraint(sum_of(assign_vars[w][shift] for shift in empty_shifts) <= max_shifts)
+        prob.addConstraint(sum_of(assign_vars[w][shift] for shift in empty_shifts) >= min_shifts)
+    
+    # CONSTRAINTS 3-5 add one row per worker per pair of days, e.g. "at most one out of all the
+    # Nights of day X and all the Days of day X+1", instead of one row per pair of shifts.
+    # Same rotas are forbidden: CONSTRAINT 6 already allows only one Night (and one Day)
+    # per worker per day, so the only way to go over 1 is one shift from each day.
+    def add_next_day_rule(first_type, next_type):
+        for day in sorted(shifts_by_day):
+            first_shifts = shifts_by_day_type.get((day, first_type), [])
+            next_shifts = shifts_by_day_type.get((day + 1, next_type), [])
+            if not first_shifts or not next_shifts:
+                continue
+            for w in workers:
+                add_at_most_one(assign_vars[w][shift] for shift in first_shifts + next_shifts)
+
     # CONSTRAINT 3: No Night → Day next day (any units)
-    for pair in bad_night_to_day_pairs:
-        night, day = pair
-        for w in workers:
-            prob += assign_vars[w][night] + assign_vars[w][day] <= 1
+    add_next_day_rule("Night", "Day")
     
     # CONSTRAINT 4: No adjacent nights (if enabled)
     if enforce_no_adj_nights:
-        for pair in bad_adjacent_nights_pairs:
-            current, next_shift = pair
-            for w in workers:
-                prob += assign_vars[w][current] + assign_vars[w][next_shift] <= 1
+        add_next_day_rule("Night", "Night")
     
     # CONSTRAINT 5: No adjacent days (if enabled)
     if enforce_no_adj_days:
-        for pair in bad_adjacent_days_pairs:
-            current, next_shift = pair
-            for w in workers:
-                prob += assign_vars[w][current] + assign_vars[w][next_shift] <= 1
+        add_next_day_rule("Day", "Day")
     
     # CONSTRAINT 6: No two shifts on same day (except allowed 24hr)
     # This prevents: "Day 5 Cardiology" + "Night 5 Internal Medicine"
     # But allows: "Day 5 Cardiology" + "Night 5 Cardiology" (handled separately)
-    for pair in bad_same_day_non24hr_pairs:
-        shift1, shift2 = pair
+    # One row per worker per day:  (shifts on the day) - (24hr shifts on the day) <= 1
+    # A worker either has at most one shift that day, or exactly the two halves of one 24hr
+    # shift (2 - 1 = 1). Any other pair, or a third shift on top of a 24hr, goes over 1.
+    # This relies on the 24hr vars being exactly "both halves assigned" (CONSTRAINT 7).
+    for day, shifts_on_day in shifts_by_day.items():
+        day_pairs = twenty_four_pairs_by_day.get(day, [])
         for w in workers:
-            prob += assign_vars[w][shift1] + assign_vars[w][shift2] <= 1
+            day_terms = [(assign_vars[w][shift_name], 1) for shift_name, _, _ in shifts_on_day
+                         if isinstance(assign_vars[w][shift_name], pulp.LpVariable)]
+            if len(day_terms) < 2:
+                continue  # Nothing (or only one shift) this worker could take that day
+            day_terms.extend((twenty_four_vars[w][pair], -1) for pair in day_pairs
+                             if isinstance(twenty_four_vars[w][pair], pulp.LpVariable))
+            prob.addConstraint(pulp.LpAffineExpression(day_terms) <= 1)
     
     # CONSTRAINT 7: Link 24-hour variables (only for same-unit Day+Night pairs)
     for pair in twenty_four_hour_shift_pairs:
         s1, s2 = pair
         
         # Figure out which is Day and which is Night
-        type1, _, _ = parse_shift_name(s1)
-        type2, _, _ = parse_shift_name(s2)
+        type1, _, _ = shift_parts[s1]
+        type2, _, _ = shift_parts[s2]
         
         if type1 == "Day":
             day_shift, night_shift = s1, s2
@@ -387,125 +511,163 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
             day_shift, night_shift = s2, s1
         
         for w in workers:
-            # If both are assigned, 24hr var becomes 1
-            prob += twenty_four_vars[w][pair] >= assign_vars[w][day_shift] + assign_vars[w][night_shift] - 1
-            # If day is 0, 24hr var must be 0
-            prob += twenty_four_vars[w][pair] <= assign_vars[w][day_shift]
-            # If night is 0, 24hr var must be 0
-            prob += twenty_four_vars[w][pair] <= assign_vars[w][night_shift]
+            # If this worker can't do one of the halves (pruned 0), it can never be their 24hr shift:
+            # there is no 24hr var for it, so nothing to link
+            if not isinstance(twenty_four_vars[w][pair], pulp.LpVariable):
+                continue
+            # 24hr var is 1 only if both the day and the night are assigned
+            # Always linked both ways: CONSTRAINT 8 counts these against the worker's 24hr limit,
+            # and CONSTRAINT 6 lets each one excuse a second shift on its day
+            add_both_link(twenty_four_vars[w][pair], assign_vars[w][day_shift], assign_vars[w][night_shift],
+                          force_up=True, force_down=True)
     
     # CONSTRAINT 8: Limit on 24-hour shifts per worker
     for w in workers:
-        prob += pulp.lpSum(twenty_four_vars[w][pair] 
-                          for pair in twenty_four_hour_shift_pairs) <= max_24hr[w]
+        prob.addConstraint(sum_of(twenty_four_vars[w][pair]
+                                  for pair in twenty_four_hour_shift_pairs) <= max_24hr[w])
     
     # CONSTRAINT 9: Limit on weekend shifts per worker
     for w in workers:
-        prob += pulp.lpSum(assign_vars[w][shift] 
-                          for shift in empty_weekend_shifts) <= max_weekends[w]
+        prob.addConstraint(sum_of(assign_vars[w][shift]
+                                  for shift in empty_weekend_shifts) <= max_weekends[w])
     
     # CONSTRAINT 10: Link spacing variables
     for pair in bad_spacing_pairs:
         s1, s2 = pair
         for w in workers:
-            prob += spacing_var[w][pair] >= assign_vars[w][s1] + assign_vars[w][s2] - 1
-            prob += spacing_var[w][pair] <= assign_vars[w][s1]
-            prob += spacing_var[w][pair] <= assign_vars[w][s2]
-    
-    # CONSTRAINT 11: Workers cannot be assigned to forbidden shifts
-    for w in workers:
-        for forbidden_shift in worker_cannot[w]:
-            if forbidden_shift in empty_shifts:
-                prob += assign_vars[w][forbidden_shift] <= 0
-    
-    # CONSTRAINT 12: Manually assigned shifts and constraints.
-    # Respect adjacency rules between manually assigned shifts and empty shifts.
-    # Respect Max 24hr preferences between manually assigned shifts and empty shifts.
-    #
-    # The solver only knows about empty shifts - it can't see manually assigned
-    # ones when building pairs. So we need to add per-worker constraints manually.
-    #
-    # For each worker, we look at what they're already assigned, then forbid
-    # any empty shift that would violate adjacency rules with those assignments.
-
-    # First build a lookup: {worker_name: [list of their pre-assigned shift dicts]}
-    pre_assigned = {w: [] for w in workers}
-    for shift in shifts_list:
-        if shift["assigned_worker"] in pre_assigned:
-            pre_assigned[shift["assigned_worker"]].append(shift)
-
-    for w in workers:
-        for pre_shift in pre_assigned[w]:
-            pre_type, pre_day, _ = parse_shift_name(pre_shift["name"])
-
-            for empty_shift in empty_shifts:
-                emp_type, emp_day, _ = parse_shift_name(empty_shift)
-
-                # Night → Day: pre-assigned Night X, empty Day X+1
-                if pre_type == "Night" and emp_type == "Day" and emp_day == pre_day + 1:
-                    prob += assign_vars[w][empty_shift] <= 0
-
-                # Day → Night (reverse): pre-assigned Day X+1, empty Night X
-                # This handles the case where manual shift is AFTER the empty shift
-                if emp_type == "Night" and pre_type == "Day" and pre_day == emp_day + 1:
-                    prob += assign_vars[w][empty_shift] <= 0
-
-                # Night → Night: pre-assigned Night X, empty Night X+1 (or reverse)
-                if enforce_no_adj_nights and pre_type == "Night" and emp_type == "Night":
-                    if emp_day == pre_day + 1 or emp_day == pre_day - 1:
-                        prob += assign_vars[w][empty_shift] <= 0
-
-                # Day → Day: pre-assigned Day X, empty Day X+1 (or reverse)
-                if enforce_no_adj_days and pre_type == "Day" and emp_type == "Day":
-                    if emp_day == pre_day + 1 or emp_day == pre_day - 1:
-                        prob += assign_vars[w][empty_shift] <= 0
+            # Same as the 24hr vars: a pair this worker can't have both of is never "too close"
+            if not isinstance(spacing_var[w][pair], pulp.LpVariable):
+                continue
+            # Spacing vars only appear in the objective, so the sign of the points decides
+            add_both_link(spacing_var[w][pair], assign_vars[w][s1], assign_vars[w][s2],
+                          force_up=points_spacing < 0, force_down=points_spacing > 0)
+    
+    # Workers cannot be assigned to forbidden shifts, and manually assigned shifts can't clash
+    # with the empty ones: both are already handled in STEP 10, where those pairings are pruned
+    # to 0 instead of getting a variable plus a "must be 0" constraint each.
+
+    # CONSTRAINT 11: Symmetry breaking for identical workers
+    # Two workers with exactly the same limits, preferences and crossed-off shifts are
+    # interchangeable: swapping their whole rotas gives an equally good answer. Without a hint,
+    # CBC would try every such swap. So within each group of identical workers, the first one
+    # must have at least as many shifts as the next, the next at least as many as the one after...
+    # (Any good rota can be reordered like that, so nothing is lost.)
+    identical_groups = {}
+    for w_dict in workers_list:
+        w = w_dict["name"]
+        profile = (tuple(w_dict["shifts_to_fill"]), max_24hr[w], max_weekends[w],
+                   frozenset(worker_cannot_set[w]), worker_prefers[w], worker_preferred_units[w])
+        identical_groups.setdefault(profile, []).append(w)
+    for group in identical_groups.values():
+        for w_first, w_next in zip(group, group[1:]):
+            prob.addConstraint(sum_of(assign_vars[w_first][shift] for shift in empty_shifts)
+                               >= sum_of(assign_vars[w_next][shift] for shift in empty_shifts))
+
+    # ============================================================================
+    # STEP 12b: Greedy starting rota (warm start)
+    # ============================================================================
+    # Before CBC starts searching, quickly fill the rota by hand-style rules:
+    # go through the empty shifts day by day and give each one to the least busy
+    # worker who can take it without breaking a hard rule. CBC gets this as its
+    # first solution, so it can throw away any search branch that can't beat it.
+    # If the greedy rota misses someone's minimum, CBC simply ignores it - nothing breaks.
+    empty_weekend_set = set(empty_weekend_shifts)
+    greedy_count = {w: 0 for w in workers}          # Shifts given to each worker so far
+    greedy_weekends = {w: 0 for w in workers}       # Weekend shifts given so far
+    greedy_24hr = {w: 0 for w in workers}           # 24hr shifts formed so far
+    greedy_taken = {w: {} for w in workers}         # {worker: {day: [(shift_type, unit), ...]}}
+    greedy_picks = set()                            # (worker, shift_name) pairs in the greedy rota
+
+    for day in sorted(shifts_by_day):
+        for shift_name, shift_type, unit in shifts_by_day[day]:
+            best_worker = None
+            for w in workers:
+                if not isinstance(assign_vars[w][shift_name], pulp.LpVariable):
+                    continue  # Pruned - this worker can't do it
+                if greedy_count[w] >= shifts_to_fill[w][1]:
+                    continue
+                if shift_name in empty_weekend_set and greedy_weekends[w] >= max_weekends[w]:
+                    continue
+                # Same day: only the other half of a 24hr shift in the same unit is allowed
+                same_day = greedy_taken[w].get(day, [])
+                if same_day:
+                    other_type, other_unit = same_day[0]
+                    if len(same_day) > 1 or other_unit != unit or other_type == shift_type:
+                        continue
+                    if greedy_24hr[w] >= max_24hr[w]:
+                        continue
+                # Day before: no Night → Day, and no back-to-back nights/days if those rules are on
+                clash = False
+                for prev_type, _ in greedy_taken[w].get(day - 1, []):
+                    if prev_type == "Night" and shift_type == "Day":
+                        clash = True
+                    elif prev_type == "Night" and shift_type == "Night" and enforce_no_adj_nights:
+                        clash = True
+                    elif prev_type == "Day" and shift_type == "Day" and enforce_no_adj_days:
+                        clash = True
+                if clash:
+                    continue
+                if best_worker is None or greedy_count[w] < greedy_count[best_worker]:
+                    best_worker = w  # Least busy so far wins
+
+            if best_worker is None:
+                continue  # Nobody can take it - leave it empty
+            w = best_worker
+            if greedy_taken[w].get(day):
+                greedy_24hr[w] += 1
+            greedy_taken[w].setdefault(day, []).append((shift_type, unit))
+            greedy_count[w] += 1
+            if shift_name in empty_weekend_set:
+                greedy_weekends[w] += 1
+            greedy_picks.add((w, shift_name))
+
+    # Identical workers must be in "most shifts first" order (CONSTRAINT 11), or CBC would throw
+    # the greedy rota away. Their rotas are interchangeable, so just hand them out again in that order.
+    for group in identical_groups.values():
+        if len(group) < 2:
+            continue
+        rotas = sorted(([shift for (pw, shift) in greedy_picks if pw == w] for w in group), key=len, reverse=True)
+        greedy_picks -= {(pw, shift) for (pw, shift) in greedy_picks if pw in group}
+        for w, rota in zip(group, rotas):
+            greedy_picks.update((w, shift) for shift in rota)
 
+    # Hand the greedy rota to PuLP as starting values (1 = picked, 0 = not),
+    # including the 24hr and spacing variables that follow from it
     for w in workers:
-        for pre_shift in pre_assigned[w]:
-            pre_type, pre_day, pre_unit = parse_shift_name(pre_shift["name"])
-
-            for empty_shift in empty_shifts:
-                emp_type, emp_day, emp_unit = parse_shift_name(empty_shift)
-
-                # Night → Day
-                if pre_type == "Night" and emp_type == "Day" and emp_day == pre_day + 1:
-                    prob += assign_vars[w][empty_shift] <= 0
-
-                # Day → Night (reverse)
-                if emp_type == "Night" and pre_type == "Day" and pre_day == emp_day + 1:
-                    prob += assign_vars[w][empty_shift] <= 0
-
-                # Night → Night
-                if enforce_no_adj_nights and pre_type == "Night" and emp_type == "Night":
-                    if emp_day == pre_day + 1 or emp_day == pre_day - 1:
-                        prob += assign_vars[w][empty_shift] <= 0
-
-                # Day → Day
-                if enforce_no_adj_days and pre_type == "Day" and emp_type == "Day":
-                    if emp_day == pre_day + 1 or emp_day == pre_day - 1:
-                        prob += assign_vars[w][empty_shift] <= 0
+        for shift in empty_shifts:
+            var = assign_vars[w][shift]
+            if isinstance(var, pulp.LpVariable):
+                var.setInitialValue(1 if (w, shift) in greedy_picks else 0)
+        for pair in twenty_four_hour_shift_pairs:
+            if isinstance(twenty_four_vars[w][pair], pulp.LpVariable):
+                both = (w, pair[0]) in greedy_picks and (w, pair[1]) in greedy_picks
+                twenty_four_vars[w][pair].setInitialValue(1 if both else 0)
+        for pair in bad_spacing_pairs:
+            if isinstance(spacing_var[w][pair], pulp.LpVariable):
+                both = (w, pair[0]) in greedy_picks and (w, pair[1]) in greedy_picks
+                spacing_var[w][pair].setInitialValue(1 if both else 0)
 
-                # 24hr block: if worker has max_24hr = 0 and a manually assigned
-                # shift on the same day and same unit, block the other half.
-                # Same day + same unit + different type = would form a 24hr shift.
-                if max_24hr[w] == 0 and emp_day == pre_day and emp_unit == pre_unit:
-                    if {emp_type, pre_type} == {"Day", "Night"}:
-                        prob += assign_vars[w][empty_shift] <= 0
-    
     # ============================================================================
     # STEP 13: Solve the problem
     # ============================================================================
     timeLimit_setting = settings.get("time_limit", 6000)
-    print(f"Starting PuLP solve – time limit {timeLimit_setting} seconds...")
+    # CBC can search several branches at once - use up to 8 CPU cores.
+    # settings["threads"] overrides this (e.g. 1 to keep the computer free for other work).
+    threads_setting = settings.get("threads", min(8, os.cpu_count() or 1))
+    # Proving the very best rota can take far longer than finding it. CBC stops as soon as its rota
+    # is proven to be within gap_percent of the best possible one (0 = keep going until proven best).
+    gap_percent = settings.get("gap_percent", 1)
+    gap_setting = gap_percent / 100
+    print(f"Starting PuLP solve – time limit {timeLimit_setting} seconds, {threads_setting} thread(s)...")
 
     # Falls back to CBC if not .exe file:
     if hasattr(sys, '_MEIPASS'):
         cbc_path = os.path.join(sys._MEIPASS, 'cbc.exe')
         print(f"CBC path: {cbc_path}")
         print(f"CBC exists: {os.path.exists(cbc_path)}") # Debugging: check if cbc solver when packaged found
-        status = prob.solve(pulp.COIN_CMD(msg=0, timeLimit=timeLimit_setting, path=cbc_path)) # msg=0, because there is no console used and msg=1 might cause lag
+        status = prob.solve(pulp.COIN_CMD(msg=0, timeLimit=timeLimit_setting, path=cbc_path, warmStart=True, threads=threads_setting, gapRel=gap_setting)) # msg=0, because there is no console used and msg=1 might cause lag
     else:
-        status = prob.solve(pulp.PULP_CBC_CMD(msg=1, timeLimit=timeLimit_setting))
+        status = prob.solve(pulp.PULP_CBC_CMD(msg=1, timeLimit=timeLimit_setting, warmStart=True, threads=threads_setting, gapRel=gap_setting))
        # try: this part uses highspy/highsolver, but crashes on "Presolving model"
        #     # Use highspy directly (Python API, no executable needed)
        #     solver = pulp.getSolver('HiGHS')
@@ -518,31 +680,46 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
 # ============================================================================
     # STEP 14: Check solution status
     # ============================================================================
-    if pulp.LpStatus[status] == "Infeasible":
+    # Compare the numeric status code; its text is only needed for printing and the summary
+    status_text = pulp.LpStatus[status]
+
+    if status == pulp.LpStatusInfeasible:
         print("INFEASIBLE: Cannot create a valid rota with these constraints.")
         return assignments, {
             "preferences_count": 0,
             "twenty_four_count": 0,
             "bad_spacing_count": 0,
             "status": "Infeasible"
-        }
+        }, prob.sol_status
     
-    elif pulp.LpStatus[status] == "Optimal":
-        print("Found best solution in time!")
-    
-    elif pulp.LpStatus[status] == "Not Solved":
+    # PuLP also says "Optimal" when CBC hit the time limit with a rota in hand:
+    # only prob.sol_status tells them apart (IntegerFeasible = stopped early, Optimal = search finished)
+    elif status == pulp.LpStatusOptimal and prob.sol_status == pulp.LpSolutionIntegerFeasible:
+        status_text = "Stopped at time limit"
         print("Timed out – showing best found so far.")
+
+    elif status == pulp.LpStatusOptimal:
+        if gap_setting > 0:
+            # PuLP still says "Optimal" when CBC stopped at the accepted gap, but the rota
+            # was never proven best - say so in the summary instead
+            status_text = f"Within {gap_percent:g}% of best"
+            print(f"Found a rota within {gap_percent:g}% of the best possible one.")
+        else:
+            print("Found best solution in time!")
+    
+    elif status == pulp.LpStatusNotSolved:
+        print("Timed out before any rota was found.")
     
     else:
-        print("Other issue:", pulp.LpStatus[status])
+        print("Other issue:", status_text)
         return assignments, {
             "preferences_count": 0,
             "twenty_four_count": 0,
             "bad_spacing_count": 0,
-            "status": pulp.LpStatus[status]
-        }
+            "status": status_text
+        }, prob.sol_status
     
-    print(f"Solve finished! Status: {pulp.LpStatus[status]}")
+    print(f"Solve finished! Status: {status_text}")
     
     # ============================================================================
     # STEP 15: Extract the solution
@@ -569,59 +746,45 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
     bad_spacing_count = 0
     non_preferred_unit_count = 0  # How many shifts landed in a unit the worker did NOT want
     
-    # Count preferred shifts
-    for shift, worker in assignments.items():
-        if worker is None:
-            continue
-        if shift in worker_prefers[worker]:
-            preferences_count += 1
-
-    # Count shifts assigned to non-preferred units.
+    # ONE pass over the final assignments does three jobs at once:
+    #   - counts preferred shifts
+    #   - counts shifts in non-preferred units
+    #   - groups each worker's (day, unit) so 24hr shifts and bad spacing can be counted below
     #
-    # WHY THIS APPROACH?
-    # We loop through every final assignment (shift → worker pair).
-    # For each one, we ask three questions in order:
+    # Non-preferred units: we ask three questions in order:
     #   1. Was this shift actually assigned? (worker is not None)
     #   2. Does this worker even have unit preferences? (if not, skip — no preference = no penalty)
     #   3. Is the shift's unit NOT in their preferred list? (if so, count it)
     #
-    # parse_shift_name() already exists and gives us the unit for free,
+    # shift_parts already has the day and unit for every shift,
     # so we reuse it rather than writing new parsing code.
     #
     # WHY .get() with a default?
     # worker_preferred_units is a dictionary. If somehow a worker name
     # isn't in it (e.g. a manually-assigned shift), .get(worker, []) 
     # returns an empty list instead of crashing with a KeyError.
+    worker_shifts = defaultdict(list)  # {worker: [(day, unit), ...]}
     for shift, worker in assignments.items():
         if worker is None:
             continue                                           # Skip unassigned shifts
+        _, day, unit = shift_parts[shift]
+
+        if shift in worker_prefers[worker]:
+            preferences_count += 1
+
         preferred_units = worker_preferred_units.get(worker, [])
-        if not preferred_units:
-            continue                                           # Worker has no unit preference — skip
-        _, _, unit = parse_shift_name(shift)                  # Get the unit from the shift name
-        if unit not in preferred_units:
+        if preferred_units and unit not in preferred_units:
             non_preferred_unit_count += 1                     # Unit was NOT in their preferred list
-    
-    # Group shifts by worker
-    worker_shifts = {}
-    for shift, worker in assignments.items():
-        if worker is not None:
-            if worker not in worker_shifts:
-                worker_shifts[worker] = []
-            worker_shifts[worker].append(shift)
+
+        worker_shifts[worker].append((day, unit))
     
     # Count 24-hour shifts and bad spacing
     for worker, shifts in worker_shifts.items():
         # Sort shifts by day number
-        sorted_shifts = sorted(shifts, key=lambda s: parse_shift_name(s)[1])
+        sorted_shifts = sorted(shifts, key=lambda day_unit: day_unit[0])
         
-        for i in range(len(sorted_shifts) - 1):
-            current = sorted_shifts[i]
-            next_shift = sorted_shifts[i+1]
-            
-            _, current_day, current_unit = parse_shift_name(current)
-            _, next_day, next_unit = parse_shift_name(next_shift)
-            
+        # Walk neighbouring shifts: (1st, 2nd), (2nd, 3rd), ...
+        for (current_day, current_unit), (next_day, next_unit) in zip(sorted_shifts, sorted_shifts[1:]):
             # Same day AND same unit = 24-hour shift
             if current_day == next_day and current_unit == next_unit:
                 twenty_four_count += 1
@@ -647,8 +810,43 @@ def solve_rota(shifts_list, workers_list, units_list, settings):
         "twenty_four_count": twenty_four_count,
         "bad_spacing_count": bad_spacing_count,
         "non_preferred_unit_count": non_preferred_unit_count,
-        "status": pulp.LpStatus[status],
+        "status": status_text,
         "total_points": total_points
     }
     
+    return assignments, summary, prob.sol_status
+
+
+# ============================================================================
+# Remember recent results
+# ============================================================================
+# Pressing "Create Rota" again without changing anything used to run CBC all over again.
+# The last few results are kept here, keyed by a fingerprint of everything the solver reads.
+_solve_cache = OrderedDict()  # {fingerprint: (assignments, summary)}, oldest first
+SOLVE_CACHE_SIZE = 32
+
+def solve_rota(shifts_list, workers_list, units_list, settings):
+    """
+    Solve the rota, or hand back the saved result if the exact same rota was solved recently.
+    Takes the same things as _solve_rota_uncached() and returns (assignments, summary).
+    """
+    # sort_keys → the same data always gives the same text, whatever order the dict keys were added in
+    fingerprint_text = json.dumps([shifts_list, workers_list, units_list, settings], sort_keys=True, default=str)
+    fingerprint = hashlib.blake2b(fingerprint_text.encode("utf-8")).hexdigest()
+
+    if fingerprint in _solve_cache:
+        print("Nothing changed since this rota was last solved – reusing that result.")
+        _solve_cache.move_to_end(fingerprint)  # Mark as recently used
+        assignments, summary = _solve_cache[fingerprint]
+        return dict(assignments), dict(summary)  # Copies, so the caller can't change the saved result
+
+    assignments, summary, solution_status = _solve_rota_uncached(shifts_list, workers_list, units_list, settings)
+
+    # Only keep rotas from a finished search (proven best, or within the accepted gap).
+    # A time-limit stop reports status "Optimal" too, but its sol_status is IntegerFeasible -
+    # solving again (e.g. with a longer time limit) can do better, so that one isn't kept.
+    if solution_status == pulp.LpSolutionOptimal:
+        _solve_cache[fingerprint] = (dict(assignments), dict(summary))
+        if len(_solve_cache) > SOLVE_CACHE_SIZE:
+            _solve_cache.popitem(last=False)  # Forget the oldest one
     return assignments, summary